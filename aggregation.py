@@ -0,0 +1,112 @@
+"""Инкрементальная агрегация результатов тренировок.
+
+Итоги (количество, длительность, дистанция, калории и средняя
+скорость) ведутся по пользователю и по паре пользователь - вид
+тренировки. Каждое новое сообщение обновляет итоги за O(1), поэтому
+историю тренировок пересматривать не нужно.
+"""
+import time
+from collections import deque
+from typing import Deque, Dict, Hashable, Optional, Tuple, Union
+
+import homework
+
+Key = Tuple[Hashable, Optional[str]]
+
+
+class Totals:
+    """Накопленные суммы по группе тренировок."""
+
+    __slots__ = ('count', 'duration', 'distance', 'calories')
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.duration = 0.0
+        self.distance = 0.0
+        self.calories = 0.0
+
+    def add(self, info: homework.InfoMessage, sign: int = 1) -> None:
+        """Добавить (или при ``sign=-1`` вычесть) тренировку."""
+        self.count += sign
+        self.duration += sign * info.duration
+        self.distance += sign * info.distance
+        self.calories += sign * info.calories
+
+    @property
+    def mean_speed(self) -> float:
+        """Средняя скорость, взвешенная по длительности (км/ч)."""
+        return self.distance / self.duration if self.duration else 0.0
+
+    def as_dict(self) -> Dict[str, float]:
+        """Вернуть итоги в виде словаря."""
+        return {'count': self.count,
+                'duration': self.duration,
+                'distance': self.distance,
+                'calories': self.calories,
+                'mean_speed': self.mean_speed}
+
+
+class Aggregator:
+    """Итоги по пользователям за все время и за скользящее окно.
+
+    Окно длиной ``window`` секунд хранит очередь тренировок в порядке
+    поступления: вышедшие из окна тренировки вычитаются из итогов,
+    поэтому обновление стоит O(1) в среднем. Временные метки должны
+    поступать в неубывающем порядке.
+    """
+
+    def __init__(self, window: Optional[float] = None) -> None:
+        self.window = window
+        self._totals: Dict[Key, Totals] = {}
+        self._window_totals: Dict[Key, Totals] = {}
+        self._window_items: Deque[Tuple[float, Hashable,
+                                        homework.InfoMessage]] = deque()
+
+    @staticmethod
+    def _keys(user_id: Hashable, info: homework.InfoMessage
+              ) -> Tuple[Key, Key]:
+        return (user_id, None), (user_id, info.training_type)
+
+    def add(self,
+            user_id: Hashable,
+            result: Union[homework.InfoMessage, homework.Training],
+            timestamp: Optional[float] = None) -> None:
+        """Учесть результат тренировки пользователя."""
+        if isinstance(result, homework.Training):
+            result = result.show_training_info()
+        for key in self._keys(user_id, result):
+            self._totals.setdefault(key, Totals()).add(result)
+        if self.window is None:
+            return
+        if timestamp is None:
+            timestamp = time.time()
+        self._expire(timestamp)
+        self._window_items.append((timestamp, user_id, result))
+        for key in self._keys(user_id, result):
+            self._window_totals.setdefault(key, Totals()).add(result)
+
+    def _expire(self, now: float) -> None:
+        """Вычесть из итогов окна тренировки старше ``window`` секунд."""
+        items = self._window_items
+        while items and now - items[0][0] >= self.window:
+            _, user_id, info = items.popleft()
+            for key in self._keys(user_id, info):
+                totals = self._window_totals[key]
+                totals.add(info, sign=-1)
+                if not totals.count:
+                    del self._window_totals[key]
+
+    def totals(self, user_id: Hashable,
+               training_type: Optional[str] = None) -> Totals:
+        """Вернуть итоги пользователя за все время."""
+        return self._totals.get((user_id, training_type), Totals())
+
+    def window_totals(self,
+                      user_id: Hashable,
+                      training_type: Optional[str] = None,
+                      now: Optional[float] = None) -> Totals:
+        """Вернуть итоги пользователя за последние ``window`` секунд."""
+        if self.window is None:
+            raise ValueError('Окно агрегации не задано')
+        self._expire(time.time() if now is None else now)
+        return self._window_totals.get((user_id, training_type), Totals())
@@ -0,0 +1,352 @@
+"""Замеры производительности модуля фитнес-трекера."""
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set
+
+import homework
+
+# Пакеты, на которых проводятся замеры, по одному на вид тренировки.
+PACKAGES: Dict[str, homework.Package] = {
+    'Running': ('RUN', [15000, 1, 75]),
+    'SportsWalking': ('WLK', [9000, 1, 75, 180]),
+    'Swimming': ('SWM', [720, 1, 80, 25, 40]),
+}
+BATCH_SIZES = (1, 100, 10_000)
+
+
+@dataclass
+class LegacyInfoMessage:
+    """Сообщение в прежнем виде: с ``__dict__`` и полем-шаблоном."""
+    training_type: str
+    duration: float
+    distance: float
+    speed: float
+    calories: float
+    message: str = homework.InfoMessage.MESSAGE
+
+
+def bytes_per_record(factory: Callable[[int], object], count: int) -> float:
+    """Посчитать, сколько байт памяти занимает одна запись."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        records = [factory(index) for index in range(count)]
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    # Память под сам список записей к записям не относится.
+    list_size = records.__sizeof__()
+    return (after - before - list_size) / count
+
+
+def memory_report(count: int) -> Dict[str, float]:
+    """Сравнить расход памяти на записи до и после оптимизации."""
+    def info_args(index: int) -> List:
+        return ['Running', index / 7, index / 3, index / 11, index / 13]
+
+    report = {
+        'InfoMessage (dict)': bytes_per_record(
+            lambda index: LegacyInfoMessage(*info_args(index)), count),
+        'InfoMessage (slots)': bytes_per_record(
+            lambda index: homework.InfoMessage(*info_args(index)), count),
+    }
+    for training_class in (homework.Running, homework.SportsWalking,
+                           homework.Swimming):
+        name = training_class.__name__
+        report[f'{name} (dict)'] = bytes_per_record(
+            training_factory(training_class), count)
+        report[f'{name} (slots)'] = bytes_per_record(
+            training_factory(homework.slotted_variant(training_class)),
+            count)
+    return report
+
+
+def training_factory(training_class: type) -> Callable[[int], object]:
+    """Вернуть фабрику тренировок с уже прочитанными показателями.
+
+    Показатели читаются сразу, чтобы в замер попал и их кэш.
+    """
+    def factory(index: int) -> object:
+        values = [index, index / 7 + 1, index / 3 + 40, 180, 40]
+        training = training_class(*values[:training_class.FIELDS_COUNT])
+        training.get_spent_calories()
+        return training
+
+    return factory
+
+
+def synthetic_packages(count: int, seed: int = 0
+                       ) -> List[homework.Package]:
+    """Сгенерировать правдоподобные пакеты всех видов тренировок."""
+    generator = random.Random(seed)
+    packages: List[homework.Package] = []
+    for _ in range(count):
+        duration = round(generator.uniform(0.1, 3), 3)
+        weight = round(generator.uniform(40, 130), 1)
+        workout_type = generator.choice(('RUN', 'WLK', 'SWM'))
+        if workout_type == 'RUN':
+            data = [generator.randint(500, 40_000), duration, weight]
+        elif workout_type == 'WLK':
+            data = [generator.randint(500, 30_000), duration, weight,
+                    generator.randint(140, 210)]
+        else:
+            data = [generator.randint(100, 3000), duration, weight,
+                    generator.choice((25, 50)), generator.randint(1, 80)]
+        packages.append((workout_type, data))
+    return packages
+
+
+def allocated_by_type(roots: Sequence[object],
+                      existing: Set[int]) -> Dict[str, int]:
+    """Посчитать по типам объекты, созданные за время замера.
+
+    Обходятся объекты, достижимые из ``roots``. Объект, отслеживаемый
+    сборщиком мусора, считается новым, если его идентификатора нет в
+    ``existing``; остальные (числа, строки) - если память под них
+    выделена при работе tracemalloc. Старые объекты (классы, модули,
+    общие константы) не учитываются и не обходятся. Объекты из
+    внутренних списков свободных блоков интерпретатора могут не
+    попасть в подсчет.
+    """
+    counts: Dict[str, int] = {}
+    seen = set()
+    stack = list(roots)
+    while stack:
+        item = stack.pop()
+        if id(item) in seen:
+            continue
+        if gc.is_tracked(item):
+            if id(item) in existing:
+                continue
+        elif tracemalloc.get_object_traceback(item) is None:
+            continue
+        seen.add(id(item))
+        name = type(item).__name__
+        counts[name] = counts.get(name, 0) + 1
+        stack.extend(gc.get_referents(item))
+    return counts
+
+
+def profile_memory(count: int, top: int = 5) -> Dict[str, Any]:
+    """Профилировать память при обработке ``count`` пакетов.
+
+    Все объекты этапов (пакеты, тренировки, сообщения и их тексты)
+    удерживаются до конца замера, как при пересчете за месяц.
+    Возвращаются пиковая память, прирост по этапам в байтах на
+    тренировку, количество созданных объектов по типам (включая
+    ``__dict__`` экземпляров, числа и строки) и главные места
+    выделения памяти.
+    """
+    gc.collect()
+    existing = {id(item) for item in gc.get_objects()}
+    tracemalloc.start()
+    try:
+        stages: Dict[str, int] = {}
+        start = tracemalloc.get_traced_memory()[0]
+        packages = synthetic_packages(count)
+        stages['packages'] = tracemalloc.get_traced_memory()[0]
+        trainings = [homework.read_package(*package) for package in packages]
+        stages['read_package'] = tracemalloc.get_traced_memory()[0]
+        infos = [training.show_training_info() for training in trainings]
+        stages['show_training_info'] = tracemalloc.get_traced_memory()[0]
+        messages = [info.get_message() for info in infos]
+        stages['get_message'] = tracemalloc.get_traced_memory()[0]
+        peak = tracemalloc.get_traced_memory()[1]
+        snapshot = tracemalloc.take_snapshot()
+        types = allocated_by_type([packages, trainings, infos, messages],
+                                  existing)
+    finally:
+        tracemalloc.stop()
+    per_stage = {}
+    previous = start
+    for stage, current in stages.items():
+        per_stage[stage] = (current - previous) / count
+        previous = current
+    return {
+        'count': count,
+        'peak_bytes': peak - start,
+        'bytes_per_workout': (previous - start) / count,
+        'bytes_per_workout_by_stage': per_stage,
+        'objects_by_type': types,
+        'top_allocations': [
+            {'place': str(stat.traceback[0]), 'bytes': stat.size,
+             'count': stat.count}
+            for stat in snapshot.filter_traces([
+                tracemalloc.Filter(False, tracemalloc.__file__)
+            ]).statistics('lineno')[:top]],
+    }
+
+
+def measure(name: str,
+            batch_size: int,
+            setup: Callable[[], Sequence[Any]],
+            operation: Callable[[Any], Any],
+            repeat: int) -> Dict[str, Any]:
+    """Замерить операцию над пачкой объектов, подготовленных ``setup``.
+
+    Пачка готовится заново перед каждым повтором, чтобы кэши
+    экземпляров не влияли на результат; берется лучший повтор.
+    """
+    timings = []
+    for _ in range(repeat):
+        items = setup()
+        started = time.perf_counter()
+        for item in items:
+            operation(item)
+        timings.append(time.perf_counter() - started)
+    best = min(timings)
+    return {'name': name,
+            'batch_size': batch_size,
+            'seconds': best,
+            'ops_per_sec': batch_size / best if best else float('inf'),
+            'ns_per_op': best / batch_size * 1e9}
+
+
+def run_benchmarks(batch_sizes: Sequence[int] = BATCH_SIZES,
+                   repeat: int = 5) -> List[Dict[str, Any]]:
+    """Замерить все операции модуля на пачках разного размера."""
+    results = []
+    for batch_size in batch_sizes:
+        for class_name, package in PACKAGES.items():
+            def packages() -> List[homework.Package]:
+                return [package] * batch_size
+
+            def trainings() -> List[homework.Training]:
+                return [homework.read_package(*package)
+                        for _ in range(batch_size)]
+
+            operations = {
+                'read_package': (packages, lambda item:
+                                 homework.read_package(*item)),
+                # Весь путь пакета: создание объекта тренировки, где
+                # раньше сбрасывался кэш, расчет и текст сообщения.
+                'message_pipeline': (packages, lambda item:
+                                     homework.read_package(*item)
+                                     .show_training_info().get_message()),
+                'get_distance': (trainings, homework.Training.get_distance),
+                'get_mean_speed': (trainings, lambda item:
+                                   item.get_mean_speed()),
+                'get_spent_calories': (trainings, lambda item:
+                                       item.get_spent_calories()),
+                'show_training_info': (trainings, lambda item:
+                                       item.show_training_info()),
+            }
+            for operation, (setup, call) in operations.items():
+                results.append(measure(f'{class_name}.{operation}',
+                                       batch_size, setup, call, repeat))
+            info = homework.read_package(*package).show_training_info()
+            results.append(measure(f'{class_name}.get_message', batch_size,
+                                   lambda: [info] * batch_size,
+                                   homework.InfoMessage.get_message,
+                                   repeat))
+    return results
+
+
+def thread_scaling(packages_count: int = 20_000,
+                   threads: Optional[Sequence[int]] = None
+                   ) -> Dict[int, float]:
+    """Замерить пропускную способность общего калькулятора в потоках.
+
+    Возвращается количество пакетов в секунду для каждого числа
+    потоков. Рост с числом потоков возможен только в сборках Python
+    без GIL.
+    """
+    if threads is None:
+        threads = sorted({1, 2, 4, os.cpu_count() or 1})
+    calculator = homework.TrainingCalculator()
+    packages = list(PACKAGES.values()) * (packages_count // len(PACKAGES))
+    result = {}
+    for count in threads:
+        shards = [packages[index::count] for index in range(count)]
+        with ThreadPoolExecutor(max_workers=count) as executor:
+            started = time.perf_counter()
+            list(executor.map(calculator.format_many, shards))
+            elapsed = time.perf_counter() - started
+        result[count] = len(packages) / elapsed
+    return result
+
+
+def compare(results: List[Dict[str, Any]],
+            baseline: List[Dict[str, Any]]) -> Dict[str, float]:
+    """Вернуть отношение времени к прошлому запуску по каждому замеру."""
+    previous = {(item['name'], item['batch_size']): item['seconds']
+                for item in baseline}
+    return {f'{item["name"]}[{item["batch_size"]}]':
+            item['seconds'] / previous[(item['name'], item['batch_size'])]
+            for item in results
+            if previous.get((item['name'], item['batch_size']))}
+
+
+def print_profile(profile: Dict[str, Any]) -> None:
+    """Вывести результаты ``profile_memory``."""
+    print(f'Пик памяти: {profile["peak_bytes"] / 2 ** 20:.1f} МиБ; '
+          f'{profile["bytes_per_workout"]:.0f} байт на тренировку')
+    for stage, size in profile['bytes_per_workout_by_stage'].items():
+        print(f'  {stage}: {size:.0f} байт на тренировку')
+    for name, objects in profile['objects_by_type'].items():
+        print(f'  {name}: {objects} объектов')
+    for allocation in profile['top_allocations']:
+        print(f'  {allocation["place"]}: {allocation["bytes"]} байт')
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    """Главная функция."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--count', type=int, default=100_000,
+                        help='количество записей в замере памяти')
+    parser.add_argument('--batch-sizes', type=int, nargs='+',
+                        default=BATCH_SIZES, help='размеры пачек')
+    parser.add_argument('--repeat', type=int, default=5,
+                        help='количество повторов каждого замера')
+    parser.add_argument('--threads', type=int, nargs='*',
+                        help='замерить масштабирование по потокам')
+    parser.add_argument('--profile-memory', type=int, metavar='COUNT',
+                        help='профилировать память на COUNT пакетах')
+    parser.add_argument('--json', help='файл для результатов в JSON')
+    parser.add_argument('--compare', help='JSON с результатами '
+                        'прошлого запуска для сравнения')
+    args = parser.parse_args(argv)
+    results = run_benchmarks(args.batch_sizes, args.repeat)
+    for item in results:
+        print(f'{item["name"]}[{item["batch_size"]}]: '
+              f'{item["ns_per_op"]:.0f} нс/оп, '
+              f'{item["ops_per_sec"]:.0f} оп/с')
+    memory = memory_report(args.count)
+    for name, size in memory.items():
+        print(f'{name}: {size:.1f} байт на запись')
+    scaling = {}
+    if args.threads is not None:
+        scaling = thread_scaling(threads=args.threads or None)
+        for count, rate in scaling.items():
+            print(f'Потоков {count}: {rate:.0f} пакетов/с')
+    profile = {}
+    if args.profile_memory:
+        profile = profile_memory(args.profile_memory)
+        print_profile(profile)
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as file:
+            baseline = json.load(file)['results']
+        for name, ratio in compare(results, baseline).items():
+            print(f'{name}: {ratio:.2f}x от прошлого запуска')
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as file:
+            json.dump({'python': platform.python_version(),
+                       'machine': platform.machine(),
+                       'results': results,
+                       'memory': memory,
+                       'threads': scaling,
+                       'memory_profile': profile},
+                      file, ensure_ascii=False, indent=2)
+
+
+if __name__ == '__main__':
+    main()
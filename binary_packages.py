@@ -0,0 +1,184 @@
+"""Компактный двоичный формат пакетов с датчиков.
+
+Файл хранит данные по колонкам, поэтому при чтении через ``mmap``
+колонки доступны без копирования::
+
+    заголовок   '<4sII': сигнатура, количество записей, размер таблицы кодов
+    коды        по 4 байта на каждый код тренировки из таблицы
+    типы        uint8 на запись - номер кода в таблице
+    выравнивание нулевые байты до смещения, кратного 8, от начала файла
+    колонки     action, duration, weight, extra1, extra2 - по float64
+                (little-endian) на запись
+
+Дополнительные поля: рост для ``SportsWalking``, длина и количество
+бассейнов для ``Swimming``; неиспользуемые поля заполняются нулями.
+"""
+import mmap
+import struct
+import sys
+from array import array
+from typing import BinaryIO, Dict, Iterable, List, Tuple
+
+import homework
+
+MAGIC = b'TRN2'
+HEADER = struct.Struct('<4sII')
+CODE = struct.Struct('<4s')
+# Количество колонок с числами: action, duration, weight и два доп. поля.
+COLUMNS_COUNT = 5
+# Размер числа в колонке.
+ITEM_SIZE = 8
+
+
+def _padding(size: int) -> int:
+    """Вернуть количество байт для выравнивания до ITEM_SIZE."""
+    return -size % ITEM_SIZE
+
+
+def _code_index(codes: Dict[str, int], workout_type: str) -> int:
+    """Вернуть номер кода в таблице, добавив его при необходимости."""
+    if workout_type not in codes:
+        if len(workout_type.encode('ascii')) > CODE.size:
+            raise ValueError(f'Слишком длинный код {workout_type}')
+        if len(codes) > 255:
+            raise ValueError('Слишком много кодов тренировок')
+        codes[workout_type] = len(codes)
+    return codes[workout_type]
+
+
+def write_packages(file: BinaryIO,
+                   packages: Iterable[homework.Package]) -> int:
+    """Записать пакеты в двоичном формате и вернуть их количество.
+
+    Каждый пакет проверяется ``validate_package``: некорректный пакет
+    (неизвестный код, не то количество полей, недопустимое значение)
+    вызывает ``ValueError``.
+    """
+    codes: Dict[str, int] = {}
+    types = array('B')
+    columns = [array('d') for _ in range(COLUMNS_COUNT)]
+    for workout_type, data in packages:
+        reason = homework.validate_package(workout_type, data)
+        if reason is not None:
+            raise ValueError(f'пакет {workout_type} {data}: {reason}')
+        if len(data) > COLUMNS_COUNT:
+            raise ValueError(f'Слишком много полей в пакете {workout_type}')
+        types.append(_code_index(codes, workout_type))
+        for column, value in zip(columns, data):
+            column.append(value)
+        for column in columns[len(data):]:
+            column.append(0)
+    file.write(HEADER.pack(MAGIC, len(types), len(codes)))
+    for workout_type in codes:
+        file.write(CODE.pack(workout_type.encode('ascii')))
+    file.write(types.tobytes())
+    offset = HEADER.size + CODE.size * len(codes) + len(types)
+    file.write(bytes(_padding(offset)))
+    for column in columns:
+        if sys.byteorder != 'little':
+            column.byteswap()
+        file.write(column.tobytes())
+    return len(types)
+
+
+class BinaryPackages:
+    """Колонки пакетов, прочитанные из файла через ``mmap``.
+
+    Колонки - это срезы ``memoryview`` поверх отображенного в память
+    файла. Объект нужно закрыть (или использовать в ``with``), после
+    закрытия колонки недоступны.
+    """
+
+    def __init__(self, path: str) -> None:
+        with open(path, 'rb') as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._views: List[memoryview] = []
+        try:
+            self._read_columns()
+        except Exception:
+            self.close()
+            raise
+
+    def _view(self, start: int, size: int, fmt: str) -> memoryview:
+        view = memoryview(self._mmap)[start:start + size]
+        self._views.append(view)
+        if fmt == 'B':
+            return view
+        column = view.cast(fmt)
+        self._views.append(column)
+        return column
+
+    def _read_columns(self) -> None:
+        if len(self._mmap) < HEADER.size:
+            raise ValueError('Файл пакетов поврежден')
+        magic, count, codes_count = HEADER.unpack_from(self._mmap)
+        if magic != MAGIC:
+            raise ValueError('Неизвестный формат файла пакетов')
+        offset = HEADER.size
+        self.codes: Tuple[str, ...] = tuple(
+            CODE.unpack_from(self._mmap, offset + CODE.size * index)[0]
+            .rstrip(b'\0').decode('ascii')
+            for index in range(codes_count))
+        offset += CODE.size * codes_count
+        if len(self._mmap) < offset + count:
+            raise ValueError('Файл пакетов поврежден')
+        self.types = self._view(offset, count, 'B')
+        offset += count
+        offset += _padding(offset)
+        if len(self._mmap) != offset + COLUMNS_COUNT * ITEM_SIZE * count:
+            raise ValueError('Файл пакетов поврежден')
+        columns = []
+        for _ in range(COLUMNS_COUNT):
+            if sys.byteorder == 'little':
+                columns.append(self._view(offset, ITEM_SIZE * count, 'd'))
+            else:
+                column = array('d', self._mmap[offset:
+                                               offset + ITEM_SIZE * count])
+                column.byteswap()
+                columns.append(column)
+            offset += ITEM_SIZE * count
+        self.actions, self.durations, self.weights, *self.extras = columns
+
+    def __len__(self) -> int:
+        return len(self.types)
+
+    @property
+    def workout_types(self) -> List[str]:
+        """Коды тренировок по записям (ссылки на строки из таблицы)."""
+        codes = self.codes
+        return [codes[index] for index in self.types]
+
+    def compute(self) -> Tuple[array, array, array]:
+        """Посчитать дистанцию, скорость и калории для всех записей.
+
+        Если в файле один вид тренировки, колонки передаются расчету
+        как есть. Иначе записи группируются в ``compute_batch``, и
+        значения каждой группы копируются в списки Python: расчет
+        идет без объекта тренировки на запись, но не без копирования.
+        """
+        if len(self.codes) != 1:
+            return homework.compute_batch(self.workout_types, self.actions,
+                                          self.durations, self.weights,
+                                          self.extras)
+        training_class = homework.TRAINING_CLASSES.get(self.codes[0])
+        if training_class is None:
+            raise ValueError(f'Неопределенный тип тренировки '
+                             f'{self.codes[0]}')
+        columns = training_class.compute_metrics(
+            self.actions, self.durations, self.weights, self.extras)
+        distances, speeds, calories = (array('d', column)
+                                       for column in columns)
+        return distances, speeds, calories
+
+    def close(self) -> None:
+        """Освободить колонки и закрыть отображение файла."""
+        for view in reversed(self._views):
+            view.release()
+        self._views.clear()
+        self._mmap.close()
+
+    def __enter__(self) -> 'BinaryPackages':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
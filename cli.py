@@ -0,0 +1,108 @@
+"""Консольный запуск расчета тренировок для пакетных заданий.
+
+Использование::
+
+    python cli.py [--timing] [--format ФОРМАТ] [-f ФАЙЛ ...] [ПАКЕТ ...]
+
+Пакет передается одной строкой, например ``'RUN 15000 1 75'``.
+Файлы содержат по пакету в строке, ``-`` означает стандартный ввод.
+Если не указаны ни пакеты, ни файлы, пакеты читаются из стандартного
+ввода. ``--format`` выбирает формат отчета: ``text`` (по умолчанию),
+``csv`` или ``jsonl``. ``--timing`` выводит в stderr время запуска и
+обработки. Обработка останавливается с кодом 1 на первом
+некорректном пакете или недоступном файле.
+
+Модули расчета и отчетов импортируются только после разбора
+аргументов, а тяжелые модули стандартной библиотеки не импортируются
+вовсе, чтобы короткие запуски тратили минимум времени на старт.
+"""
+import sys
+import time
+
+STARTED = time.perf_counter()
+
+USAGE = __doc__.split('\n\n')[1].strip()
+
+
+def option_value(arguments, option: str) -> str:
+    """Вернуть значение параметра ``option`` из оставшихся аргументов."""
+    try:
+        return next(arguments)
+    except StopIteration:
+        raise SystemExit(f'{USAGE}\nНе указано значение для {option}')
+
+
+def parse_args(argv: list[str]
+               ) -> tuple[list[str], list[str], bool, str]:
+    """Разобрать аргументы: вернуть пакеты, файлы, флаг замера и формат."""
+    packages: list[str] = []
+    files: list[str] = []
+    timing = False
+    fmt = 'text'
+    arguments = iter(argv)
+    for argument in arguments:
+        if argument in ('-h', '--help'):
+            print(__doc__)
+            raise SystemExit(0)
+        if argument == '--timing':
+            timing = True
+        elif argument in ('-f', '--file'):
+            files.append(option_value(arguments, argument))
+        elif argument == '--format':
+            fmt = option_value(arguments, argument)
+        else:
+            packages.append(argument)
+    return packages, files, timing, fmt
+
+
+def iter_sources(packages: list[str], files: list[str]):
+    """Лениво перебрать строки пакетов из аргументов и файлов."""
+    yield from packages
+    for path in files:
+        if path == '-':
+            yield from sys.stdin
+            continue
+        with open(path, encoding='utf-8') as file:
+            yield from file
+    if not packages and not files:
+        yield from sys.stdin
+
+
+def checked_packages(lines):
+    """Разобрать пакеты и остановиться на первом некорректном."""
+    import homework
+    for workout_type, data in homework.iter_packages(lines):
+        reason = homework.validate_package(workout_type, data)
+        if reason is not None:
+            raise ValueError(f'пакет {workout_type} {data}: {reason}')
+        yield workout_type, data
+
+
+def run(argv: list[str] | None = None) -> int:
+    """Обработать пакеты и вернуть код завершения."""
+    packages, files, timing, fmt = parse_args(
+        sys.argv[1:] if argv is None else argv)
+    import homework
+    import report
+    imported = time.perf_counter()
+    count = 0
+    try:
+        count = report.write_report(
+            homework.stream_training_info(
+                checked_packages(iter_sources(packages, files))),
+            fmt=fmt, chunk_size=1000)
+    except (ValueError, TypeError, OSError) as error:
+        print(f'Ошибка: {error}', file=sys.stderr)
+        return 1
+    finally:
+        sys.stdout.flush()
+        if timing:
+            finished = time.perf_counter()
+            print(f'Запуск: {(imported - STARTED) * 1000:.2f} мс; '
+                  f'обработка: {(finished - imported) * 1000:.2f} мс; '
+                  f'пакетов: {count}', file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(run())
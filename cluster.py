@@ -0,0 +1,255 @@
+"""Распределенный пакетный пересчет тренировок по шардам.
+
+Координатор делит записи ``(user_id, workout_type, data)`` на шарды
+по пользователю или по виду тренировки и раздает их рабочим
+процессам. Рабочие общаются с координатором через каналы по
+протоколу JSON Lines, поэтому на одной машине они заменяют узлы
+кластера::
+
+    координатор -> {"shard": 3, "packages": [["RUN", [15000, 1, 75]], ...]}
+    рабочий     -> {"shard": 3, "results": [["Running", 1, 9.75, ...], ...]}
+    рабочий     -> {"shard": 3, "error": "описание"}
+
+Упавший шард отправляется повторно (в том числе после перезапуска
+рабочего), а результаты собираются в порядке исходных записей,
+поэтому итог не зависит от распределения шардов между рабочими.
+"""
+import argparse
+import json
+import os
+import queue
+import subprocess
+import sys
+import threading
+import zlib
+from typing import IO, Dict, Hashable, List, Optional, Sequence, Tuple
+
+import homework
+
+Record = Tuple[Hashable, str, List[float]]
+Shard = List[int]
+# Поля сообщения в порядке передачи по протоколу.
+FIELDS = ('training_type', 'duration', 'distance', 'speed', 'calories')
+
+
+def partition(records: Sequence[Record],
+              shards: int,
+              by: str = 'user') -> List[Shard]:
+    """Разбить записи на шарды и вернуть индексы записей в каждом.
+
+    Шард определяется по CRC32 от пользователя или кода тренировки,
+    а не по ``hash()``, чтобы разбиение не менялось между запусками.
+    """
+    if shards < 1:
+        raise ValueError('Количество шардов должно быть положительным')
+    if by not in ('user', 'workout_type'):
+        raise ValueError(f'Неизвестный ключ разбиения {by}')
+    result: List[Shard] = [[] for _ in range(shards)]
+    for index, (user_id, workout_type, _) in enumerate(records):
+        key = str(user_id) if by == 'user' else workout_type
+        result[zlib.crc32(key.encode()) % shards].append(index)
+    return result
+
+
+def process_shard(packages: List[homework.Package]) -> List[List]:
+    """Посчитать пакеты шарда и вернуть поля сообщений."""
+    return [[getattr(info, field) for field in FIELDS]
+            for info in homework.process_packages(packages)]
+
+
+def run_worker(source: IO[str], target: IO[str]) -> None:
+    """Обрабатывать шарды из ``source``, пока он не закроется."""
+    for line in source:
+        request = json.loads(line)
+        try:
+            response = {'shard': request['shard'],
+                        'results': process_shard(request['packages'])}
+        except Exception as error:
+            response = {'shard': request['shard'], 'error': str(error)}
+        target.write(json.dumps(response, ensure_ascii=False) + '\n')
+        target.flush()
+
+
+class Worker:
+    """Рабочий процесс, которому координатор отправляет шарды."""
+
+    def __init__(self, command: Sequence[str]) -> None:
+        self.command = list(command)
+        self.process: Optional[subprocess.Popen] = None
+
+    def start(self) -> None:
+        """Запустить процесс рабочего, если он не запущен."""
+        if self.process is None or self.process.poll() is not None:
+            self.process = subprocess.Popen(
+                self.command, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                text=True, encoding='utf-8')
+
+    def send(self, shard: int, packages: List[homework.Package]
+             ) -> List[List]:
+        """Отправить шард и дождаться результата."""
+        self.start()
+        try:
+            self.process.stdin.write(json.dumps(
+                {'shard': shard, 'packages': packages},
+                ensure_ascii=False) + '\n')
+            self.process.stdin.flush()
+            line = self.process.stdout.readline()
+        except (BrokenPipeError, OSError):
+            line = ''
+        if not line:
+            self.stop()
+            raise RuntimeError(f'Рабочий завершился на шарде {shard}')
+        response = json.loads(line)
+        if 'error' in response:
+            raise ValueError(response['error'])
+        return response['results']
+
+    def stop(self) -> None:
+        """Остановить процесс рабочего."""
+        if self.process is None:
+            return
+        for stream in (self.process.stdin, self.process.stdout):
+            try:
+                stream.close()
+            except OSError:
+                pass
+        self.process.wait()
+        self.process = None
+
+
+def worker_command() -> List[str]:
+    """Вернуть команду запуска локального рабочего процесса."""
+    return [sys.executable, os.path.abspath(__file__), 'worker']
+
+
+class Dispatcher:
+    """Очередь шардов, которую разбирают потоки рабочих процессов."""
+
+    def __init__(self,
+                 records: Sequence[Record],
+                 shard_indexes: List[Shard],
+                 retries: int) -> None:
+        self.records = records
+        self.shard_indexes = shard_indexes
+        self.retries = retries
+        self.tasks: queue.Queue = queue.Queue()
+        for shard in range(len(shard_indexes)):
+            self.tasks.put((shard, 0))
+        self.results: Dict[int, List[List]] = {}
+        self.failures: List[str] = []
+        self._lock = threading.Lock()
+
+    def fail(self, shard: int, error: Exception) -> None:
+        """Запомнить ошибку шарда; остальные потоки остановятся."""
+        with self._lock:
+            self.failures.append(f'Шард {shard}: {error}')
+
+    def serve(self, worker: Worker) -> None:
+        """Отправлять шарды рабочему, пока они есть и нет ошибок."""
+        while not self.failures:
+            try:
+                shard, attempt = self.tasks.get_nowait()
+            except queue.Empty:
+                return
+            packages = [list(self.records[index][1:])
+                        for index in self.shard_indexes[shard]]
+            try:
+                fields = worker.send(shard, packages)
+            except ValueError as error:
+                # Ошибка в данных повторится на любом рабочем.
+                self.fail(shard, error)
+                return
+            except RuntimeError as error:
+                if attempt >= self.retries:
+                    self.fail(shard, error)
+                    return
+                self.tasks.put((shard, attempt + 1))
+                continue
+            with self._lock:
+                self.results[shard] = fields
+
+
+def run_sharded(records: Sequence[Record],
+                shards: int = 8,
+                workers: int = 2,
+                by: str = 'user',
+                retries: int = 2,
+                command: Optional[Sequence[str]] = None
+                ) -> Tuple[List[homework.InfoMessage],
+                           Dict[str, Dict[str, float]]]:
+    """Пересчитать записи на рабочих процессах и объединить результат.
+
+    Возвращаются сообщения в порядке записей и итоги по видам
+    тренировок: количество, длительность, дистанция и калории.
+    Шард, рабочий которого завершился, отправляется повторно не
+    более ``retries`` раз; ошибка в данных шарда не повторяется.
+    """
+    shard_indexes = [indexes
+                     for indexes in partition(records, shards, by)
+                     if indexes]
+    dispatcher = Dispatcher(records, shard_indexes, retries)
+    pool = [Worker(command or worker_command()) for _ in range(workers)]
+    threads = [threading.Thread(target=dispatcher.serve, args=(worker,))
+               for worker in pool]
+    try:
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        for worker in pool:
+            worker.stop()
+    if dispatcher.failures:
+        raise RuntimeError('; '.join(dispatcher.failures))
+    return merge(len(records), shard_indexes, dispatcher.results)
+
+
+def merge(count: int,
+          shard_indexes: List[Shard],
+          results: Dict[int, List[List]]
+          ) -> Tuple[List[homework.InfoMessage], Dict[str, Dict[str, float]]]:
+    """Собрать результаты шардов в порядке исходных записей."""
+    messages: List[Optional[homework.InfoMessage]] = [None] * count
+    for shard, indexes in enumerate(shard_indexes):
+        for index, fields in zip(indexes, results[shard]):
+            messages[index] = homework.InfoMessage(*fields)
+    totals: Dict[str, Dict[str, float]] = {}
+    for info in messages:
+        total = totals.setdefault(info.training_type, {
+            'count': 0, 'duration': 0, 'distance': 0, 'calories': 0})
+        total['count'] += 1
+        total['duration'] += info.duration
+        total['distance'] += info.distance
+        total['calories'] += info.calories
+    return messages, totals
+
+
+def main() -> None:
+    """Главная функция."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    commands = parser.add_subparsers(dest='command', required=True)
+    commands.add_parser('worker', help='запустить рабочего')
+    run = commands.add_parser('run', help='пересчитать файл записей')
+    run.add_argument('path', help='JSON Lines: [user_id, код, данные]')
+    run.add_argument('--shards', type=int, default=8)
+    run.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    run.add_argument('--by', choices=('user', 'workout_type'),
+                     default='user')
+    run.add_argument('--retries', type=int, default=2)
+    args = parser.parse_args()
+    if args.command == 'worker':
+        run_worker(sys.stdin, sys.stdout)
+        return
+    with open(args.path, encoding='utf-8') as file:
+        records = [tuple(json.loads(line)) for line in file if line.strip()]
+    messages, totals = run_sharded(records, args.shards, args.workers,
+                                   args.by, args.retries)
+    sys.stdout.write(homework.format_messages(messages))
+    for training_type, total in sorted(totals.items()):
+        print(f'{training_type}: {total["count"]} тренировок, '
+              f'{total["distance"]:.3f} км, {total["calories"]:.3f} ккал',
+              file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
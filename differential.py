@@ -0,0 +1,227 @@
+"""Дифференциальная проверка быстрых реализаций расчета.
+
+На наборе из эталонных пакетов, сетки целочисленных пакетов и
+большого количества случайных эталонная реализация (формулы и
+форматирование в исходном виде, объект на каждую тренировку)
+сравнивается с альтернативными движками. Движок должен совпадать с
+эталоном точно, без расхождений даже в последнем бите. Для каждого движка
+выводятся наибольшие абсолютное и относительное расхождения по
+полям сообщения, количество несовпавших строк отчета и время
+работы рядом со временем эталона.
+"""
+import argparse
+import random
+import time
+from dataclasses import asdict
+from typing import Callable, Dict, List, Optional, Sequence
+
+import homework
+
+Engine = Callable[[List[homework.Package]], List[homework.InfoMessage]]
+# Числовые поля сообщения, по которым считается расхождение.
+FIELDS = ('duration', 'distance', 'speed', 'calories')
+# Пакеты, на которых изменение порядка операций уже меняло отчет:
+# округление калорий до трех знаков попадает на границу.
+GOLDEN_PACKAGES: List[homework.Package] = [
+    ('SWM', [720, 1, 80, 25, 40]),
+    ('RUN', [15000, 1, 75]),
+    ('WLK', [9000, 1, 75, 180]),
+    ('RUN', [250, 1, 75]),
+    ('RUN', [0, 1.5, 75]),
+    ('RUN', [500, 0.25, 90]),
+]
+# Длительности для сетки: целые значения приводят к совпадениям на
+# границах округления чаще, чем случайные.
+GRID_DURATIONS = (0.25, 0.5, 1, 1.5, 2, 3)
+
+
+def reference_info(workout_type: str,
+                   data: Sequence[float]) -> homework.InfoMessage:
+    """Посчитать сообщение по формулам в исходном, несвернутом виде."""
+    training_class = homework.TRAINING_CLASSES[workout_type]
+    action, duration, weight, *extras = data
+    distance = action * training_class.LEN_STEP / training_class.M_IN_KM
+    if workout_type == 'SWM':
+        length_pool, count_pool = extras
+        speed = (length_pool * count_pool
+                 / training_class.M_IN_KM / duration)
+        calories = ((speed + training_class.CALORIES_MEAN_SPEED_MULTIPLIER)
+                    * training_class.CALORIES_MEAN_SPEED_SHIFT
+                    * weight * duration)
+    elif workout_type == 'WLK':
+        height = extras[0] / training_class.CM_IN_M
+        speed = distance / duration
+        calories = ((training_class.CALORIES_WEIGHT_MULTIPLIER * weight
+                     + ((speed * training_class.KMH_IN_MSEC)**2 / height)
+                     * training_class.CALORIES_SPEED_HEIGHT_MULTIPLIER
+                     * weight) * (duration * training_class.MIN_IN_H))
+    elif workout_type == 'RUN':
+        speed = distance / duration
+        calories = ((training_class.CALORIES_MEAN_SPEED_MULTIPLIER
+                    * speed + training_class.CALORIES_MEAN_SPEED_SHIFT)
+                    * weight / training_class.M_IN_KM
+                    * (duration * training_class.MIN_IN_H))
+    else:
+        raise ValueError(f'Нет эталона для тренировки {workout_type}')
+    return homework.InfoMessage(training_class.__name__, duration,
+                                distance, speed, calories)
+
+
+def reference_message(info: homework.InfoMessage) -> str:
+    """Отформатировать сообщение исходным способом через str.format."""
+    return info.MESSAGE.format(**asdict(info))
+
+
+def integer_grid() -> List[homework.Package]:
+    """Вернуть сетку пакетов с целыми количеством действий и весом."""
+    extras = {'RUN': [[]], 'WLK': [[160], [180]], 'SWM': [[25, 40], [50, 20]]}
+    return [(workout_type, [action, duration, weight] + extra)
+            for workout_type, variants in extras.items()
+            for extra in variants
+            for action in range(0, 20_001, 500)
+            for duration in GRID_DURATIONS
+            for weight in range(40, 121, 10)]
+
+
+def generate_corpus(count: int, seed: int = 0) -> List[homework.Package]:
+    """Сгенерировать набор корректных пакетов, включая крайние.
+
+    В начало набора попадают эталонные пакеты и сетка целочисленных,
+    затем ``count`` случайных: кроме правдоподобных значений это очень
+    короткие и очень длинные тренировки, дробные количества действий
+    и значения на границах округления до трех знаков.
+    """
+    generator = random.Random(seed)
+
+    def number(low: float, high: float) -> float:
+        kind = generator.random()
+        if kind < 0.6:
+            return round(generator.uniform(low, high), 3)
+        if kind < 0.7:
+            return generator.randint(int(low) + 1, int(high))
+        if kind < 0.8:
+            # Значения вида x.xxx5, чувствительные к округлению.
+            return int(generator.uniform(low, high) * 1000) / 1000 + 0.0005
+        if kind < 0.9:
+            return generator.uniform(low, low + (high - low) / 1000)
+        return generator.uniform(low, high)
+
+    corpus = GOLDEN_PACKAGES + integer_grid()
+    for _ in range(count):
+        workout_type = generator.choice(('RUN', 'WLK', 'SWM'))
+        data = [number(0, 60_000), number(0.001, 24), number(1, 300)]
+        if workout_type == 'WLK':
+            data.append(number(50, 250))
+        elif workout_type == 'SWM':
+            data += [number(10, 100), number(0, 200)]
+        corpus.append((workout_type, data))
+    return corpus
+
+
+def objects_engine(packages: List[homework.Package]
+                   ) -> List[homework.InfoMessage]:
+    """Текущая реализация: объект тренировки на каждый пакет."""
+    return homework.process_packages(packages)
+
+
+def calculator_engine(packages: List[homework.Package]
+                      ) -> List[homework.InfoMessage]:
+    """Потокобезопасный калькулятор с кэшем повторов."""
+    calculator = homework.TrainingCalculator(homework.PackageCache())
+    return calculator.calculate_many(packages)
+
+
+ENGINES: Dict[str, Engine] = {
+    'objects': objects_engine,
+    'batch': homework.compute_messages,
+    'calculator': calculator_engine,
+}
+
+
+def compare(packages: List[homework.Package],
+            engines: Optional[Dict[str, Engine]] = None,
+            examples: int = 3) -> Dict[str, Dict]:
+    """Сравнить движки с эталоном на наборе пакетов.
+
+    Для каждого движка возвращаются наибольшие расхождения по полям,
+    количество несовпавших строк отчета (и первые ``examples`` из
+    них), время движка и эталона.
+    """
+    started = time.perf_counter()
+    expected = [reference_info(*package) for package in packages]
+    expected_messages = [reference_message(info) for info in expected]
+    reference_time = time.perf_counter() - started
+    report = {}
+    for name, engine in (engines or ENGINES).items():
+        started = time.perf_counter()
+        actual = engine(packages)
+        messages = homework.format_messages(actual).splitlines()
+        elapsed = time.perf_counter() - started
+        if len(actual) != len(expected):
+            raise ValueError(f'Движок {name} вернул {len(actual)} '
+                             f'результатов вместо {len(expected)}')
+        drift = {field: {'abs': 0.0, 'rel': 0.0} for field in FIELDS}
+        for reference, result in zip(expected, actual):
+            for field in FIELDS:
+                difference = abs(getattr(result, field)
+                                 - getattr(reference, field))
+                scale = abs(getattr(reference, field))
+                field_drift = drift[field]
+                field_drift['abs'] = max(field_drift['abs'], difference)
+                if scale:
+                    field_drift['rel'] = max(field_drift['rel'],
+                                             difference / scale)
+        mismatches = [(index, reference, message)
+                      for index, (reference, message)
+                      in enumerate(zip(expected_messages, messages))
+                      if reference != message]
+        report[name] = {
+            'drift': drift,
+            'type_mismatches': sum(
+                reference.training_type != result.training_type
+                for reference, result in zip(expected, actual)),
+            'format_mismatches': len(mismatches),
+            'examples': [{'package': packages[index],
+                          'expected': reference,
+                          'actual': message}
+                         for index, reference, message
+                         in mismatches[:examples]],
+            'seconds': elapsed,
+            'reference_seconds': reference_time,
+            'speedup': reference_time / elapsed if elapsed else None,
+        }
+    return report
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Главная функция."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--count', type=int, default=100_000,
+                        help='количество пакетов в наборе')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--engine', action='append', choices=ENGINES,
+                        help='проверить только указанные движки')
+    args = parser.parse_args(argv)
+    engines = {name: ENGINES[name] for name in args.engine or ENGINES}
+    report = compare(generate_corpus(args.count, args.seed), engines)
+    failed = False
+    for name, result in report.items():
+        drift = ', '.join(f'{field} {values["rel"]:.2e}'
+                          for field, values in result['drift'].items())
+        print(f'{name}: {result["seconds"]:.3f} с '
+              f'(эталон {result["reference_seconds"]:.3f} с, '
+              f'x{result["speedup"]:.2f}); '
+              f'относительное расхождение: {drift}; '
+              f'несовпадений строк: {result["format_mismatches"]}')
+        for example in result['examples']:
+            print(f'  {example["package"]}:\n'
+                  f'    ожидалось: {example["expected"]}\n'
+                  f'    получено:  {example["actual"]}')
+        failed = failed or bool(
+            result['format_mismatches'] or result['type_mismatches']
+            or any(values['abs'] for values in result['drift'].values()))
+    return int(failed)
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
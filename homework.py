@@ -1,43 +1,178 @@
-from dataclasses import dataclass, asdict
-from typing import List, Type
+import inspect
+import math
+import re
+import threading
+import time
+import types
+from array import array
+from collections import OrderedDict
+from dataclasses import dataclass
+from itertools import islice
+from operator import attrgetter
+from string import Formatter
+from typing import (Callable, ClassVar, Dict, Iterable, Iterator, List,
+                    Optional, Sequence, Tuple, Type, Union)
 
+# Спецификации формата, которые одинаково понимают str.format и %.
+PERCENT_COMPATIBLE_SPEC = re.compile(r'(\.\d+)?[eEfFgG]|')
 
-@dataclass
+
+def compile_template(template: str) -> Tuple[str, Tuple[str, ...]]:
+    """Перевести шаблон str.format в %-шаблон и список его полей.
+
+    %-форматирование не разбирает шаблон при каждом вызове, а
+    результат совпадает с str.format для поддерживаемых спецификаций.
+    """
+    parts: List[str] = []
+    fields: List[str] = []
+    for literal, field, spec, conversion in Formatter().parse(template):
+        parts.append(literal.replace('%', '%%'))
+        if field is None:
+            continue
+        if conversion or not PERCENT_COMPATIBLE_SPEC.fullmatch(spec):
+            raise ValueError(f'Неподдерживаемое поле шаблона {field}')
+        fields.append(field)
+        parts.append('%' + (spec or 's'))
+    return ''.join(parts), tuple(fields)
+
+
+@dataclass(frozen=True, slots=True)
 class InfoMessage:
     """Информационное сообщение о тренировке."""
+    # Шаблон сообщения, общий для всех экземпляров.
+    MESSAGE: ClassVar[str] = ('Тип тренировки: {training_type}; '
+                              'Длительность: {duration:.3f} ч.; '
+                              'Дистанция: {distance:.3f} км; '
+                              'Ср. скорость: {speed:.3f} км/ч; '
+                              'Потрачено ккал: {calories:.3f}.')
+    # Шаблон, заранее переведенный в %-формат, и его поля.
+    TEMPLATE: ClassVar[str]
+    FIELDS: ClassVar[Tuple[str, ...]]
+    TEMPLATE, FIELDS = compile_template(MESSAGE)
+    FIELDS_GETTER: ClassVar[attrgetter] = attrgetter(*FIELDS)
     training_type: str
     duration: float
     distance: float
     speed: float
     calories: float
-    message: str = ('Тип тренировки: {training_type}; '
-                    'Длительность: {duration:.3f} ч.; '
-                    'Дистанция: {distance:.3f} км; '
-                    'Ср. скорость: {speed:.3f} км/ч; '
-                    'Потрачено ккал: {calories:.3f}.')
 
     def get_message(self) -> str:
         """Вернуть информационное сообщение о выполненной тренировке."""
-        return self.message.format(**asdict(self))
+        return self.TEMPLATE % self.FIELDS_GETTER(self)
+
+
+# Реестр видов тренировок: код тренировки -> класс.
+TRAINING_CLASSES: Dict[str, Type['Training']] = {}
+
+
+class CachedMetric:
+    """Показатель, который вычисляется при первом обращении.
+
+    Значение сохраняется в ``__dict__`` экземпляра под именем
+    атрибута и дальше читается без вызова дескриптора. В отличие от
+    ``functools.cached_property`` в Python 3.11, первое обращение не
+    берет блокировку, общую для всех экземпляров класса: в худшем
+    случае два потока посчитают одно и то же значение дважды.
+    """
+
+    def __init__(self, function: Callable[['Training'], float]) -> None:
+        self.function = function
+        self.name = function.__name__
+        self.__doc__ = function.__doc__
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self.name = name
+
+    def __get__(self, instance: Optional['Training'], owner: type = None):
+        if instance is None:
+            return self
+        value = instance.__dict__[self.name] = self.function(instance)
+        return value
+
+
+class InputField(property):
+    """Свойство входного поля тренировки, созданное ``input_field``."""
+
+
+def input_field(name: str) -> InputField:
+    """Вернуть свойство входного поля тренировки.
+
+    Значение хранится в атрибуте ``_<name>``: конструктор записывает
+    его напрямую, а изменение через свойство сбрасывает кэш
+    показателей, поэтому при создании объекта сброс не выполняется.
+    """
+    attribute = '_' + name
+
+    def set_value(self: 'Training', value) -> None:
+        setattr(self, attribute, value)
+        cache = getattr(self, '__dict__', None)
+        if cache is not None:
+            for metric in self.CACHED_METRICS:
+                cache.pop(metric, None)
+
+    return InputField(attrgetter(attribute), set_value,
+                      doc=f'Входное поле {name}.')
 
 
 class Training:
-    """Базовый класс тренировки."""
+    """Базовый класс тренировки.
+
+    Дочерний класс регистрируется в ``TRAINING_CLASSES``, если указать
+    код тренировки при наследовании: ``class Cycling(Training,
+    code='CYC')``. Кэш показателей сбрасывается при изменении полей,
+    объявленных через ``input_field``.
+    """
     # Расстояние, преодалеваемое за один шаг.
     LEN_STEP: float = 0.65
     # Константа для перевода метров в километры.
     M_IN_KM: int = 1000
     # Константа для перевода часов в минуты.
     MIN_IN_H: int = 60
+    # Производные показатели, которые кэшируются в экземпляре.
+    CACHED_METRICS: Tuple[str, ...] = ('distance', 'mean_speed',
+                                       'spent_calories')
+    # Код тренировки, поля пакета для нее и их количество.
+    CODE: ClassVar[Optional[str]] = None
+    FIELD_NAMES: ClassVar[Tuple[str, ...]] = ('action', 'duration', 'weight')
+    FIELDS_COUNT: ClassVar[int] = 3
+    # Поля, которые должны быть строго больше нуля, остальные - не
+    # меньше нуля.
+    POSITIVE_FIELDS: ClassVar[Tuple[str, ...]] = ('duration', 'weight')
+    # Совпадают ли колоночные формулы класса с формулами объекта.
+    COLUMN_FORMULAS: ClassVar[bool] = True
+    action = input_field('action')
+    duration = input_field('duration')
+    weight = input_field('weight')
+
+    def __init_subclass__(cls, code: Optional[str] = None, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+        cls.COLUMN_FORMULAS = cls.has_column_formulas()
+        if code is not None:
+            register_training(code, cls)
 
     def __init__(self,
                  action: int,
                  duration: float,
                  weight: float
                  ) -> None:
-        self.action = action
-        self.duration = duration
-        self.weight = weight
+        self._action = action
+        self._duration = duration
+        self._weight = weight
+
+    @CachedMetric
+    def distance(self) -> float:
+        """Дистанция в км, вычисляется один раз."""
+        return self.get_distance()
+
+    @CachedMetric
+    def mean_speed(self) -> float:
+        """Средняя скорость (км/ч), вычисляется один раз."""
+        return self.get_mean_speed()
+
+    @CachedMetric
+    def spent_calories(self) -> float:
+        """Затраченные калории, вычисляются один раз."""
+        return self.get_spent_calories()
 
     def get_distance(self) -> float:
         """Получить дистанцию в км."""
@@ -45,7 +180,7 @@ class Training:
 
     def get_mean_speed(self) -> float:
         """Получить среднюю скорость движения (км/ч)."""
-        return self.get_distance() / self.duration
+        return self.distance / self.duration
 
     def get_spent_calories(self) -> float:
         """Получить количество затраченных калорий."""
@@ -56,12 +191,112 @@ class Training:
         """Вернуть информационное сообщение о выполненной тренировке."""
         return InfoMessage(self.__class__.__name__,
                            self.duration,
-                           self.get_distance(),
-                           self.get_mean_speed(),
-                           self.get_spent_calories())
+                           self.distance,
+                           self.mean_speed,
+                           self.spent_calories)
+
+    @classmethod
+    def has_column_formulas(cls) -> bool:
+        """Проверить, что колоночные методы не отстают от формул объекта.
+
+        Если дочерний класс переопределил ``get_distance``,
+        ``get_mean_speed`` или ``get_spent_calories``, но не
+        соответствующие колоночные методы, колоночный расчет дал бы
+        результат родительского класса.
+        """
+        mro = cls.__mro__
+
+        def depth(name: str) -> int:
+            return next(index for index, klass in enumerate(mro)
+                        if name in vars(klass))
+
+        columns = depth('compute_columns')
+        calories = min(columns, depth('compute_calories'))
+        return (columns <= min(depth('get_distance'),
+                               depth('get_mean_speed'))
+                and calories <= depth('get_spent_calories'))
+
+    @classmethod
+    def compute_metrics(cls,
+                        actions: Sequence[float],
+                        durations: Sequence[float],
+                        weights: Sequence[float],
+                        extras: Sequence[Sequence[float]]
+                        ) -> Tuple[List[float], List[float], List[float]]:
+        """Посчитать дистанцию, скорость и калории для колонок данных.
 
+        Если колоночные формулы класса не совпадают с формулами
+        объекта (``COLUMN_FORMULAS``), показатели считаются через
+        объект тренировки на каждую строку.
+        """
+        if cls.COLUMN_FORMULAS:
+            return cls.compute_columns(actions, durations, weights, extras)
+        distances: List[float] = []
+        speeds: List[float] = []
+        calories: List[float] = []
+        for row in zip(actions, durations, weights,
+                       *extras[:cls.FIELDS_COUNT - 3]):
+            training = cls(*row)
+            distances.append(training.distance)
+            speeds.append(training.mean_speed)
+            calories.append(training.spent_calories)
+        return distances, speeds, calories
 
-class Running(Training):
+    @classmethod
+    def compute_columns(cls,
+                        actions: Sequence[float],
+                        durations: Sequence[float],
+                        weights: Sequence[float],
+                        extras: Sequence[Sequence[float]]
+                        ) -> Tuple[List[float], List[float], List[float]]:
+        """Посчитать дистанцию, скорость и калории для колонок данных."""
+        distances = [action * cls.LEN_STEP / cls.M_IN_KM
+                     for action in actions]
+        speeds = [distance / duration
+                  for distance, duration in zip(distances, durations)]
+        return distances, speeds, cls.compute_calories(speeds, durations,
+                                                       weights, extras)
+
+    @classmethod
+    def compute_calories(cls,
+                         speeds: Sequence[float],
+                         durations: Sequence[float],
+                         weights: Sequence[float],
+                         extras: Sequence[Sequence[float]]
+                         ) -> List[float]:
+        """Посчитать калории для колонок данных."""
+        raise NotImplementedError('Метод расчета калорий'
+                                  ' должен быть определен в дочернем классе')
+
+
+def register_training(code: str, training_class: Type[Training]) -> None:
+    """Зарегистрировать вид тренировки под кодом ``code``.
+
+    Количество полей пакета определяется по сигнатуре ``__init__``
+    один раз при регистрации: все параметры должны быть обязательными
+    позиционными.
+    """
+    if not code or not isinstance(code, str):
+        raise ValueError('Код тренировки должен быть непустой строкой')
+    if code in TRAINING_CLASSES:
+        raise ValueError(f'Код тренировки {code} уже зарегистрирован '
+                         f'для {TRAINING_CLASSES[code].__name__}')
+    parameters = list(
+        inspect.signature(training_class.__init__).parameters.values())[1:]
+    for parameter in parameters:
+        if (parameter.kind is not parameter.POSITIONAL_OR_KEYWORD
+                or parameter.default is not parameter.empty):
+            raise ValueError(f'Параметр {parameter.name} класса '
+                             f'{training_class.__name__} должен быть '
+                             'обязательным позиционным')
+    training_class.CODE = code
+    training_class.FIELD_NAMES = tuple(parameter.name
+                                       for parameter in parameters)
+    training_class.FIELDS_COUNT = len(parameters)
+    TRAINING_CLASSES[code] = training_class
+
+
+class Running(Training, code='RUN'):
     """Тренировка: бег."""
     # Константа для нормализации средний скорости.
     CALORIES_MEAN_SPEED_MULTIPLIER: float = 18
@@ -70,14 +305,28 @@ class Running(Training):
 
     def get_spent_calories(self) -> float:
         """Получить количество затраченных калорий."""
-        speed = self.get_mean_speed()
         return ((self.CALORIES_MEAN_SPEED_MULTIPLIER
-                * speed + self.CALORIES_MEAN_SPEED_SHIFT)
+                * self.mean_speed + self.CALORIES_MEAN_SPEED_SHIFT)
                 * self.weight / self.M_IN_KM
                 * (self.duration * self.MIN_IN_H))
 
+    @classmethod
+    def compute_calories(cls,
+                         speeds: Sequence[float],
+                         durations: Sequence[float],
+                         weights: Sequence[float],
+                         extras: Sequence[Sequence[float]]
+                         ) -> List[float]:
+        """Посчитать калории для колонок данных."""
+        return [(cls.CALORIES_MEAN_SPEED_MULTIPLIER
+                * speed + cls.CALORIES_MEAN_SPEED_SHIFT)
+                * weight / cls.M_IN_KM
+                * (duration * cls.MIN_IN_H)
+                for speed, duration, weight
+                in zip(speeds, durations, weights)]
+
 
-class SportsWalking(Training):
+class SportsWalking(Training, code='WLK'):
     """Тренировка: спортивная ходьба."""
     # Константа для нормализации веса.
     CALORIES_WEIGHT_MULTIPLIER: float = 0.035
@@ -87,6 +336,8 @@ class SportsWalking(Training):
     KMH_IN_MSEC: float = 0.278
     # Константа для перевода роста из см в метры.
     CM_IN_M: int = 100
+    POSITIVE_FIELDS = Training.POSITIVE_FIELDS + ('height',)
+    height = input_field('height')
 
     def __init__(self,
                  action: int,
@@ -94,19 +345,33 @@ class SportsWalking(Training):
                  weight: float,
                  height: float,
                  ) -> None:
-        self.height = height / self.CM_IN_M
+        self._height = height / self.CM_IN_M
         super().__init__(action, duration, weight)
 
     def get_spent_calories(self) -> float:
         """Получить количество затраченных калорий."""
-        speed = self.get_mean_speed()
         return ((self.CALORIES_WEIGHT_MULTIPLIER * self.weight
-                 + ((speed * self.KMH_IN_MSEC)**2 / self.height)
+                 + ((self.mean_speed * self.KMH_IN_MSEC)**2 / self.height)
                  * self.CALORIES_SPEED_HEIGHT_MULTIPLIER
                  * self.weight) * (self.duration * self.MIN_IN_H))
 
+    @classmethod
+    def compute_calories(cls,
+                         speeds: Sequence[float],
+                         durations: Sequence[float],
+                         weights: Sequence[float],
+                         extras: Sequence[Sequence[float]]
+                         ) -> List[float]:
+        """Посчитать калории для колонок данных."""
+        return [(cls.CALORIES_WEIGHT_MULTIPLIER * weight
+                 + ((speed * cls.KMH_IN_MSEC)**2 / (height / cls.CM_IN_M))
+                 * cls.CALORIES_SPEED_HEIGHT_MULTIPLIER
+                 * weight) * (duration * cls.MIN_IN_H)
+                for speed, duration, weight, height
+                in zip(speeds, durations, weights, extras[0])]
 
-class Swimming(Training):
+
+class Swimming(Training, code='SWM'):
     """Тренировка: плавание."""
     # Расстояние, преодалеваемое за один гребок.
     LEN_STEP: float = 1.38
@@ -114,6 +379,9 @@ class Swimming(Training):
     CALORIES_MEAN_SPEED_MULTIPLIER: float = 1.1
     # Константа для нормализации средней скорости.
     CALORIES_MEAN_SPEED_SHIFT: int = 2
+    POSITIVE_FIELDS = Training.POSITIVE_FIELDS + ('length_pool',)
+    length_pool = input_field('length_pool')
+    count_pool = input_field('count_pool')
 
     def __init__(self,
                  action: int,
@@ -122,8 +390,8 @@ class Swimming(Training):
                  length_pool,
                  count_pool
                  ) -> None:
-        self.length_pool = length_pool
-        self.count_pool = count_pool
+        self._length_pool = length_pool
+        self._count_pool = count_pool
         super().__init__(action, duration, weight)
 
     def get_mean_speed(self) -> float:
@@ -133,21 +401,503 @@ class Swimming(Training):
 
     def get_spent_calories(self) -> float:
         """Получить количество затраченных калорий."""
-        speed = self.get_mean_speed()
-        return ((speed + self.CALORIES_MEAN_SPEED_MULTIPLIER)
+        return ((self.mean_speed + self.CALORIES_MEAN_SPEED_MULTIPLIER)
                 * self.CALORIES_MEAN_SPEED_SHIFT
                 * self.weight * self.duration)
 
+    @classmethod
+    def compute_columns(cls,
+                        actions: Sequence[float],
+                        durations: Sequence[float],
+                        weights: Sequence[float],
+                        extras: Sequence[Sequence[float]]
+                        ) -> Tuple[List[float], List[float], List[float]]:
+        """Посчитать дистанцию, скорость и калории для колонок данных."""
+        distances = [action * cls.LEN_STEP / cls.M_IN_KM
+                     for action in actions]
+        speeds = [length_pool * count_pool / cls.M_IN_KM / duration
+                  for length_pool, count_pool, duration
+                  in zip(extras[0], extras[1], durations)]
+        return distances, speeds, cls.compute_calories(speeds, durations,
+                                                       weights, extras)
+
+    @classmethod
+    def compute_calories(cls,
+                         speeds: Sequence[float],
+                         durations: Sequence[float],
+                         weights: Sequence[float],
+                         extras: Sequence[Sequence[float]]
+                         ) -> List[float]:
+        """Посчитать калории для колонок данных."""
+        return [(speed + cls.CALORIES_MEAN_SPEED_MULTIPLIER)
+                * cls.CALORIES_MEAN_SPEED_SHIFT
+                * weight * duration
+                for speed, duration, weight
+                in zip(speeds, durations, weights)]
+
+
+# Варианты классов тренировок без ``__dict__``: класс -> вариант.
+SLOTTED_CLASSES: Dict[type, type] = {}
+
+
+def _rebind_super(function: types.FunctionType,
+                  owner: type) -> types.FunctionType:
+    """Вернуть копию функции, в которой ``super()`` относится к ``owner``."""
+    code = function.__code__
+    if '__class__' not in code.co_freevars:
+        return function
+    closure = tuple(types.CellType(owner) if name == '__class__' else cell
+                    for name, cell in zip(code.co_freevars,
+                                          function.__closure__))
+    copy = types.FunctionType(code, function.__globals__, function.__name__,
+                              function.__defaults__, closure)
+    copy.__kwdefaults__ = function.__kwdefaults__
+    copy.__doc__ = function.__doc__
+    copy.__qualname__ = f'{owner.__qualname__}.{function.__name__}'
+    return copy
+
+
+def _slotted_namespace(training_class: type) -> dict:
+    """Вернуть пространство имён варианта класса без ``__dict__``."""
+    namespace = {}
+    slots = []
+    for name, value in vars(training_class).items():
+        if name in ('__dict__', '__weakref__', '__slots__'):
+            continue
+        if isinstance(value, InputField):
+            slots.append('_' + name)
+        elif isinstance(value, CachedMetric):
+            value = property(value.function, doc=value.__doc__)
+        namespace[name] = value
+    namespace['__slots__'] = tuple(slots)
+    return namespace
+
+
+def slotted_variant(training_class: Type[Training]) -> Type[Training]:
+    """Вернуть вариант класса тренировки с ``__slots__`` вместо ``__dict__``.
+
+    Вариант повторяет иерархию исходного класса и его формулы, а
+    входные поля, объявленные через ``input_field``, хранит в слотах.
+    Показатели в варианте не кэшируются: они пересчитываются при
+    каждом обращении, зато объект не держит словарь атрибутов. Имя
+    класса совпадает с исходным, поэтому совпадают и сообщения.
+    """
+    variant = SLOTTED_CLASSES.get(training_class)
+    if variant is not None:
+        return variant
+    if training_class is Training:
+        base: type = object
+    else:
+        if (len(training_class.__bases__) != 1
+                or not issubclass(training_class.__base__, Training)):
+            raise ValueError(f'Класс {training_class.__name__} должен '
+                             'наследоваться только от тренировки')
+        base = slotted_variant(training_class.__base__)
+    namespace = _slotted_namespace(training_class)
+    namespace['__qualname__'] = f'Slotted{training_class.__qualname__}'
+    variant = type(training_class.__name__, (base,), namespace)
+    for name, value in namespace.items():
+        if isinstance(value, types.FunctionType):
+            setattr(variant, name, _rebind_super(value, variant))
+        elif isinstance(value, classmethod):
+            setattr(variant, name,
+                    classmethod(_rebind_super(value.__func__, variant)))
+    SLOTTED_CLASSES[training_class] = variant
+    return variant
+
+
+SlottedTraining = slotted_variant(Training)
+SlottedRunning = slotted_variant(Running)
+SlottedSportsWalking = slotted_variant(SportsWalking)
+SlottedSwimming = slotted_variant(Swimming)
+
 
 def read_package(workout_type: str, data: List[int]) -> Training:
     """Прочитать данные полученные от датчиков."""
-    training_classes: dict[str, Type[Training]] = {'SWM': Swimming,
-                                                   'RUN': Running,
-                                                   'WLK': SportsWalking}
     try:
-        return training_classes[workout_type](*data)
+        training_class = TRAINING_CLASSES[workout_type]
     except KeyError:
         raise ValueError(f'Неопределенный тип тренировки {workout_type}')
+    if len(data) != training_class.FIELDS_COUNT:
+        raise ValueError(f'Тренировка {workout_type} ожидает '
+                         f'{training_class.FIELDS_COUNT} полей, '
+                         f'получено {len(data)}')
+    return training_class(*data)
+
+
+def compute_batch(workout_types: Sequence[str],
+                  actions: Sequence[float],
+                  durations: Sequence[float],
+                  weights: Sequence[float],
+                  extras: Sequence[Sequence[float]] = ()
+                  ) -> Tuple[array, array, array]:
+    """Посчитать дистанцию, скорость и калории для пачки тренировок.
+
+    Данные передаются колонками: ``extras`` - последовательность колонок
+    с дополнительными полями (рост для ходьбы, длина и количество
+    бассейнов для плавания), незаполненные значения игнорируются.
+    """
+    groups: Dict[str, List[int]] = {}
+    for index, workout_type in enumerate(workout_types):
+        groups.setdefault(workout_type, []).append(index)
+    size = len(workout_types)
+    distances = array('d', bytes(8 * size))
+    speeds = array('d', bytes(8 * size))
+    calories = array('d', bytes(8 * size))
+    for workout_type, indexes in groups.items():
+        try:
+            training_class = TRAINING_CLASSES[workout_type]
+        except KeyError:
+            raise ValueError(f'Неопределенный тип тренировки {workout_type}')
+        columns = training_class.compute_metrics(
+            [actions[i] for i in indexes],
+            [durations[i] for i in indexes],
+            [weights[i] for i in indexes],
+            [[column[i] for i in indexes] for column in extras])
+        for column, values in zip((distances, speeds, calories), columns):
+            for index, value in zip(indexes, values):
+                column[index] = value
+    return distances, speeds, calories
+
+
+Package = Tuple[str, List[float]]
+Reject = Tuple[int, Package, str]
+
+
+def compute_messages(packages: Sequence[Package]) -> List[InfoMessage]:
+    """Посчитать сообщения для проверенных пакетов через ``compute_batch``.
+
+    Недостающие дополнительные поля дополняются нулями, чтобы пакеты
+    разных видов тренировок можно было разложить по колонкам.
+    """
+    if not packages:
+        return []
+    width = max(len(data) for _, data in packages)
+    workout_types = [workout_type for workout_type, _ in packages]
+    columns = list(zip(*(list(data) + [0] * (width - len(data))
+                         for _, data in packages)))
+    distances, speeds, calories = compute_batch(
+        workout_types, columns[0], columns[1], columns[2], columns[3:])
+    names = [TRAINING_CLASSES[workout_type].__name__
+             for workout_type in workout_types]
+    return [InfoMessage(*fields)
+            for fields in zip(names, columns[1], distances, speeds, calories)]
+
+
+def check_value(name: str, value, positive: bool) -> Optional[str]:
+    """Вернуть причину, по которой значение поля недопустимо."""
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return f'поле {name} должно быть числом'
+    try:
+        finite = math.isfinite(value)
+    except OverflowError:
+        # Целое число, которое не помещается в float.
+        finite = False
+    if not finite:
+        return f'поле {name} должно быть конечным числом'
+    if positive and value <= 0:
+        return f'поле {name} должно быть больше нуля'
+    if value < 0:
+        return f'поле {name} не может быть отрицательным'
+    return None
+
+
+def validate_package(workout_type: str, data: Sequence) -> Optional[str]:
+    """Проверить пакет и вернуть причину отказа или ``None``."""
+    training_class = TRAINING_CLASSES.get(workout_type)
+    if training_class is None:
+        return f'неопределенный тип тренировки {workout_type}'
+    if len(data) != training_class.FIELDS_COUNT:
+        return (f'ожидается {training_class.FIELDS_COUNT} полей, '
+                f'получено {len(data)}')
+    positive_fields = training_class.POSITIVE_FIELDS
+    for name, value in zip(training_class.FIELD_NAMES, data):
+        reason = check_value(name, value, name in positive_fields)
+        if reason is not None:
+            return reason
+    return None
+
+
+# Типы, которые ``check_value`` считает числами.
+NUMBER_TYPES = frozenset((int, float))
+
+
+def column_is_valid(column: Sequence, positive: bool) -> bool:
+    """Быстро проверить колонку значений целиком.
+
+    ``False`` не означает, что колонка содержит ошибку: в этом случае
+    значения нужно проверить по одному.
+    """
+    if not NUMBER_TYPES.issuperset(map(type, column)):
+        return False
+    try:
+        if not all(map(math.isfinite, column)):
+            return False
+    except OverflowError:
+        return False
+    low = min(column)
+    return low > 0 if positive else low >= 0
+
+
+def validate_packages(packages: Iterable[Package]
+                      ) -> Tuple[List[Package], List[Reject]]:
+    """Проверить пачку пакетов и отделить отклоненные.
+
+    Пакеты группируются по коду тренировки, и каждое поле группы
+    проверяется сразу для всей колонки. Поштучная проверка нужна
+    только для групп, в которых колонка не прошла быструю проверку.
+    Возвращаются принятые пакеты в исходном порядке и список
+    отклоненных в виде ``(индекс, пакет, причина)``.
+    """
+    packages = list(packages)
+    groups: Dict[str, List[int]] = {}
+    rejected: List[Reject] = []
+    for index, (workout_type, data) in enumerate(packages):
+        training_class = TRAINING_CLASSES.get(workout_type)
+        if (training_class is None
+                or len(data) != training_class.FIELDS_COUNT):
+            rejected.append((index, packages[index],
+                             validate_package(workout_type, data)))
+            continue
+        groups.setdefault(workout_type, []).append(index)
+    for workout_type, indexes in groups.items():
+        training_class = TRAINING_CLASSES[workout_type]
+        columns = zip(*(packages[index][1] for index in indexes))
+        if all(column_is_valid(column,
+                               name in training_class.POSITIVE_FIELDS)
+               for name, column in zip(training_class.FIELD_NAMES, columns)):
+            continue
+        for index in indexes:
+            reason = validate_package(*packages[index])
+            if reason is not None:
+                rejected.append((index, packages[index], reason))
+    rejected.sort(key=lambda reject: reject[0])
+    rejected_indexes = {reject[0] for reject in rejected}
+    accepted = [package for index, package in enumerate(packages)
+                if index not in rejected_indexes]
+    return accepted, rejected
+
+
+def parse_package(line: str) -> Package:
+    """Разобрать строку пакета вида ``RUN 15000 1 75``."""
+    workout_type, *fields = line.split()
+    data: List[float] = []
+    for field in fields:
+        try:
+            data.append(int(field))
+        except ValueError:
+            data.append(float(field))
+    return workout_type, data
+
+
+def iter_packages(source: Iterable[Union[str, Package]]
+                  ) -> Iterator[Package]:
+    """Лениво прочитать пакеты из итерируемого источника.
+
+    Источником может быть файл или любой итератор строк, а также
+    последовательность готовых пар ``(workout_type, data)``. Пустые
+    строки и строки-комментарии (``#``) пропускаются.
+    """
+    for item in source:
+        if not isinstance(item, str):
+            yield item
+            continue
+        line = item.strip()
+        if line and not line.startswith('#'):
+            yield parse_package(line)
+
+
+def stream_chunks(source: Iterable[Union[str, Package]],
+                  chunk_size: int = 1000
+                  ) -> Iterator[List[InfoMessage]]:
+    """Обработать поток пакетов порциями не больше ``chunk_size``.
+
+    Следующая порция читается из источника только после того, как
+    потребитель забрал предыдущую, поэтому расход памяти не зависит
+    от размера входных данных.
+    """
+    if chunk_size < 1:
+        raise ValueError('Размер порции должен быть положительным')
+    packages = iter_packages(source)
+    while True:
+        chunk = [read_package(workout_type, data).show_training_info()
+                 for workout_type, data in islice(packages, chunk_size)]
+        if not chunk:
+            return
+        yield chunk
+
+
+def stream_training_info(source: Iterable[Union[str, Package]],
+                         chunk_size: int = 1000
+                         ) -> Iterator[InfoMessage]:
+    """Лениво вернуть информационные сообщения для потока пакетов."""
+    for chunk in stream_chunks(source, chunk_size):
+        yield from chunk
+
+
+def stream_messages(source: Iterable[Union[str, Package]],
+                    chunk_size: int = 1000) -> Iterator[str]:
+    """Лениво вернуть строки отчета для потока пакетов."""
+    for info in stream_training_info(source, chunk_size):
+        yield info.get_message()
+
+
+def process_packages(packages: Iterable[Package]) -> List[InfoMessage]:
+    """Последовательно обработать пакеты и вернуть сообщения."""
+    return [read_package(workout_type, data).show_training_info()
+            for workout_type, data in packages]
+
+
+def process_packages_parallel(packages: Sequence[Package],
+                              workers: Optional[int] = None,
+                              chunk_size: int = 10_000,
+                              min_parallel: int = 50_000
+                              ) -> List[InfoMessage]:
+    """Обработать пакеты в пуле процессов, сохранив порядок.
+
+    Пакеты делятся на порции по ``chunk_size`` штук. Если пакетов
+    меньше ``min_parallel``, расходы на передачу данных между
+    процессами не окупаются, и пакеты обрабатываются в текущем.
+    """
+    if chunk_size < 1:
+        raise ValueError('Размер порции должен быть положительным')
+    if len(packages) < min_parallel or workers == 1:
+        return process_packages(packages)
+    # Пул процессов нужен редко, а его импорт заметно замедляет
+    # запуск модуля, поэтому он импортируется только здесь.
+    from concurrent.futures import ProcessPoolExecutor
+
+    chunks = [packages[start:start + chunk_size]
+              for start in range(0, len(packages), chunk_size)]
+    result: List[InfoMessage] = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for messages in executor.map(process_packages, chunks):
+            result.extend(messages)
+    return result
+
+
+def format_messages(messages: Iterable[InfoMessage]) -> str:
+    """Вернуть сообщения о тренировках одной строкой, по одному в строке."""
+    template = InfoMessage.TEMPLATE + '\n'
+    get_fields = InfoMessage.FIELDS_GETTER
+    return ''.join([template % get_fields(info) for info in messages])
+
+
+class PackageCache:
+    """LRU-кэш результатов для повторно присланных пакетов.
+
+    Ключ - код тренировки и кортеж данных, значение - неизменяемое
+    сообщение ``InfoMessage`` и его текст. Записи старше ``ttl`` секунд
+    считаются устаревшими (``ttl=None`` - без ограничения по времени).
+    Кэш можно использовать из нескольких потоков: доступ к записям
+    защищен блокировкой, а расчет при промахе идет вне ее.
+    """
+
+    def __init__(self,
+                 capacity: int = 10_000,
+                 ttl: Optional[float] = None) -> None:
+        if capacity < 1:
+            raise ValueError('Размер кэша должен быть положительным')
+        self.capacity = capacity
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _get_entry(self, workout_type: str,
+                   data: Sequence[float]) -> Tuple[InfoMessage, str, float]:
+        key = (workout_type, tuple(data))
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and (self.ttl is None
+                                      or now - entry[2] < self.ttl):
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return entry
+            self.misses += 1
+        info = read_package(workout_type, list(data)).show_training_info()
+        entry = (info, info.get_message(), now)
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.capacity:
+                self._entries.popitem(last=False)
+        return entry
+
+    def get_info(self, workout_type: str,
+                 data: Sequence[float]) -> InfoMessage:
+        """Вернуть сообщение о тренировке, посчитав его при промахе."""
+        return self._get_entry(workout_type, data)[0]
+
+    def get_message(self, workout_type: str, data: Sequence[float]) -> str:
+        """Вернуть текст сообщения о тренировке."""
+        return self._get_entry(workout_type, data)[1]
+
+    def stats(self) -> Dict[str, int]:
+        """Вернуть статистику попаданий и промахов."""
+        with self._lock:
+            return {'hits': self.hits,
+                    'misses': self.misses,
+                    'size': len(self._entries),
+                    'capacity': self.capacity}
+
+    def clear(self) -> None:
+        """Очистить кэш и статистику."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class TrainingCalculator:
+    """Калькулятор тренировок для многопоточных серверов.
+
+    Объект можно разделять между потоками, в том числе в сборках
+    Python без GIL: каждый вызов создает собственный объект
+    тренировки, общий кэш (если он включен) защищен блокировкой,
+    а буфер для пакетного форматирования у каждого потока свой.
+    """
+
+    def __init__(self, cache: Optional[PackageCache] = None) -> None:
+        self.cache = cache
+        self._local = threading.local()
+
+    def calculate(self, workout_type: str,
+                  data: Sequence[float]) -> InfoMessage:
+        """Вернуть сообщение о тренировке для пакета."""
+        if self.cache is not None:
+            return self.cache.get_info(workout_type, data)
+        return read_package(workout_type, list(data)).show_training_info()
+
+    def message(self, workout_type: str, data: Sequence[float]) -> str:
+        """Вернуть текст сообщения о тренировке для пакета."""
+        if self.cache is not None:
+            return self.cache.get_message(workout_type, data)
+        return self.calculate(workout_type, data).get_message()
+
+    def calculate_many(self, packages: Iterable[Package]
+                       ) -> List[InfoMessage]:
+        """Вернуть сообщения о тренировках для пачки пакетов."""
+        return [self.calculate(workout_type, data)
+                for workout_type, data in packages]
+
+    def format_many(self, packages: Iterable[Package]) -> str:
+        """Вернуть текст отчета для пачки пакетов, по сообщению в строке."""
+        buffer = getattr(self._local, 'buffer', None)
+        if buffer is None:
+            buffer = self._local.buffer = []
+        try:
+            for workout_type, data in packages:
+                buffer.append(self.message(workout_type, data))
+                buffer.append('\n')
+            return ''.join(buffer)
+        finally:
+            buffer.clear()
 
 
 def main(training: Training) -> None:
@@ -157,12 +907,14 @@ def main(training: Training) -> None:
 
 
 if __name__ == '__main__':
+    import report
+
     packages = [
         ('SW1', [720, 1, 80, 25, 40]),
         ('RUN', [15000, 1, 75]),
         ('WLK', [9000, 1, 75, 180]),
     ]
 
-    for workout_type, data in packages:
-        training = read_package(workout_type, data)
-        main(training)
+    report.write_report(
+        read_package(workout_type, data).show_training_info()
+        for workout_type, data in packages)
@@ -0,0 +1,153 @@
+"""Счетчики и гистограммы задержек для горячих функций модуля.
+
+Инструментирование включается явно через ``enable()``: функции
+``read_package``, ``Training.show_training_info`` и
+``InfoMessage.get_message`` подменяются обертками, которые считают
+вызовы и время по каждому виду тренировки. После ``disable()``
+возвращаются исходные функции, и накладные расходы исчезают.
+"""
+import json
+import threading
+import time
+from functools import wraps
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import homework
+
+# Верхние границы корзин гистограммы в наносекундах: 1 мкс, 2 мкс, ...
+BUCKET_BOUNDS: Tuple[int, ...] = tuple(1000 * 2 ** power
+                                       for power in range(20))
+
+
+class Stat:
+    """Статистика вызовов одной функции для одного вида тренировки."""
+
+    __slots__ = ('count', 'total_ns', 'buckets')
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total_ns = 0
+        # Последняя корзина - для вызовов дольше BUCKET_BOUNDS[-1].
+        self.buckets = [0] * (len(BUCKET_BOUNDS) + 1)
+
+    def add(self, elapsed_ns: int) -> None:
+        """Учесть один вызов длительностью ``elapsed_ns``."""
+        self.count += 1
+        self.total_ns += elapsed_ns
+        for index, bound in enumerate(BUCKET_BOUNDS):
+            if elapsed_ns <= bound:
+                self.buckets[index] += 1
+                return
+        self.buckets[-1] += 1
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Вернуть статистику в виде словаря."""
+        return {'count': self.count,
+                'total_ns': self.total_ns,
+                'buckets': list(self.buckets)}
+
+
+class Metrics:
+    """Хранилище статистики по функциям и видам тренировок."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._stats: Dict[Tuple[str, str], Stat] = {}
+
+    def record(self, operation: str, training_type: str,
+               elapsed_ns: int) -> None:
+        """Учесть вызов функции ``operation`` для вида тренировки."""
+        key = (operation, training_type)
+        with self._lock:
+            stat = self._stats.get(key)
+            if stat is None:
+                stat = self._stats[key] = Stat()
+            stat.add(elapsed_ns)
+
+    def snapshot(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """Вернуть копию статистики: функция -> вид тренировки -> данные."""
+        result: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        with self._lock:
+            for (operation, training_type), stat in self._stats.items():
+                result.setdefault(operation, {})[training_type] = (
+                    stat.as_dict())
+        return result
+
+    def export_json(self) -> str:
+        """Вернуть статистику в формате JSON."""
+        return json.dumps({'bucket_bounds_ns': BUCKET_BOUNDS,
+                           'metrics': self.snapshot()})
+
+    def reset(self) -> None:
+        """Сбросить накопленную статистику."""
+        with self._lock:
+            self._stats.clear()
+
+
+metrics = Metrics()
+_originals: Dict[str, Callable] = {}
+
+
+def _timed(operation: str,
+           function: Callable,
+           get_type: Callable[[Tuple, Any], str]) -> Callable:
+    """Обернуть функцию замером времени с записью в ``metrics``."""
+    @wraps(function)
+    def wrapper(*args, **kwargs):
+        started = time.perf_counter_ns()
+        result = function(*args, **kwargs)
+        metrics.record(operation, get_type(args, result),
+                       time.perf_counter_ns() - started)
+        return result
+    return wrapper
+
+
+def enable() -> None:
+    """Включить инструментирование горячих функций."""
+    if _originals:
+        return
+    _originals['read_package'] = homework.read_package
+    _originals['show_training_info'] = homework.Training.show_training_info
+    _originals['get_message'] = homework.InfoMessage.get_message
+    homework.read_package = _timed(
+        'read_package', homework.read_package,
+        lambda args, result: type(result).__name__)
+    homework.Training.show_training_info = _timed(
+        'show_training_info', homework.Training.show_training_info,
+        lambda args, result: result.training_type)
+    homework.InfoMessage.get_message = _timed(
+        'get_message', homework.InfoMessage.get_message,
+        lambda args, result: args[0].training_type)
+
+
+def disable() -> None:
+    """Выключить инструментирование и вернуть исходные функции."""
+    if not _originals:
+        return
+    homework.read_package = _originals.pop('read_package')
+    homework.Training.show_training_info = _originals.pop(
+        'show_training_info')
+    homework.InfoMessage.get_message = _originals.pop('get_message')
+
+
+def is_enabled() -> bool:
+    """Проверить, включено ли инструментирование."""
+    return bool(_originals)
+
+
+def percentile_ns(stat: Dict[str, Any], percent: float) -> Optional[int]:
+    """Оценить перцентиль задержки по гистограмме.
+
+    Возвращается верхняя граница корзины или ``None``, если вызовов
+    не было или перцентиль попал в последнюю, открытую корзину.
+    """
+    if not stat['count']:
+        return None
+    threshold = stat['count'] * percent / 100
+    seen = 0
+    bounds: List[Optional[int]] = [*BUCKET_BOUNDS, None]
+    for bound, count in zip(bounds, stat['buckets']):
+        seen += count
+        if seen >= threshold:
+            return bound
+    return None
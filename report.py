@@ -0,0 +1,107 @@
+"""Вывод отчетов о тренировках пачками.
+
+Сообщения собираются в порции и записываются одним вызовом
+``write`` на порцию вместо ``print`` на каждую тренировку.
+Поддерживаются текстовый формат модуля, CSV и JSON Lines, а также
+сжатие gzip для архивов. Модули для CSV, JSON и gzip импортируются
+только при выборе соответствующего формата, чтобы не замедлять
+запуск ``cli.py`` с текстовым отчетом.
+"""
+import io
+import sys
+from itertools import islice
+from typing import Callable, Dict, Iterable, List, Optional, TextIO, Union
+
+import homework
+
+# Порядок колонок в CSV и ключей в JSON Lines.
+FIELDS = ('training_type', 'duration', 'distance', 'speed', 'calories')
+# Размер буфера файла отчета.
+BUFFER_SIZE = 1 << 20
+
+
+def format_text(messages: List[homework.InfoMessage]) -> str:
+    """Вернуть порцию сообщений в текстовом формате модуля."""
+    return homework.format_messages(messages)
+
+
+def format_csv(messages: List[homework.InfoMessage]) -> str:
+    """Вернуть порцию сообщений строками CSV."""
+    import csv
+
+    buffer = io.StringIO()
+    csv.writer(buffer, lineterminator='\n').writerows(
+        [getattr(info, field) for field in FIELDS] for info in messages)
+    return buffer.getvalue()
+
+
+def format_jsonl(messages: List[homework.InfoMessage]) -> str:
+    """Вернуть порцию сообщений в формате JSON Lines."""
+    import json
+
+    return ''.join([
+        json.dumps({field: getattr(info, field) for field in FIELDS},
+                   ensure_ascii=False) + '\n'
+        for info in messages])
+
+
+FORMATTERS: Dict[str, Callable[[List[homework.InfoMessage]], str]] = {
+    'text': format_text,
+    'csv': format_csv,
+    'jsonl': format_jsonl,
+}
+
+
+def write_report(messages: Iterable[homework.InfoMessage],
+                 output: Union[str, TextIO, None] = None,
+                 fmt: str = 'text',
+                 compress: Optional[bool] = None,
+                 chunk_size: int = 10_000) -> int:
+    """Записать сообщения в файл или поток и вернуть их количество.
+
+    ``output`` - путь к файлу, открытый текстовый поток или ``None``
+    для стандартного вывода. Сжатие включается ``compress=True`` или
+    расширением ``.gz`` у пути.
+    """
+    try:
+        formatter = FORMATTERS[fmt]
+    except KeyError:
+        raise ValueError(f'Неизвестный формат отчета {fmt}')
+    if chunk_size < 1:
+        raise ValueError('Размер порции должен быть положительным')
+    if isinstance(output, str):
+        if compress is None:
+            compress = output.endswith('.gz')
+        if compress:
+            import gzip
+
+            stream = gzip.open(output, 'wt', encoding='utf-8', newline='')
+        else:
+            stream = open(output, 'w', encoding='utf-8', newline='',
+                          buffering=BUFFER_SIZE)
+        with stream:
+            return _write_chunks(messages, stream, fmt, formatter,
+                                 chunk_size)
+    if compress:
+        raise ValueError('Сжатие поддерживается только для файлов')
+    stream = sys.stdout if output is None else output
+    count = _write_chunks(messages, stream, fmt, formatter, chunk_size)
+    stream.flush()
+    return count
+
+
+def _write_chunks(messages: Iterable[homework.InfoMessage],
+                  stream: TextIO,
+                  fmt: str,
+                  formatter: Callable[[List[homework.InfoMessage]], str],
+                  chunk_size: int) -> int:
+    if fmt == 'csv':
+        stream.write(','.join(FIELDS) + '\n')
+    count = 0
+    iterator = iter(messages)
+    while True:
+        chunk = list(islice(iterator, chunk_size))
+        if not chunk:
+            return count
+        stream.write(formatter(chunk))
+        count += len(chunk)
@@ -0,0 +1,240 @@
+"""Колоночное хранилище результатов тренировок.
+
+Результаты хранятся не списком ``InfoMessage``, а колонками:
+``duration``, ``distance``, ``speed`` и ``calories`` - массивы float64,
+``training_type`` - номера в словаре названий. Отбор по виду
+тренировки и диапазонам значений идет по колонкам без создания
+объектов. Хранилище сохраняется в компактный файл::
+
+    заголовок   '<4sII': сигнатура, количество записей, размер словаря
+    словарь     для каждого названия: длина '<H' и байты UTF-8
+    типы        uint16 на запись, с выравниванием до 8 байт
+    колонки     duration, distance, speed, calories - по float64
+                (little-endian) на запись
+
+Файл открывается через ``mmap`` без копирования колонок.
+"""
+import mmap
+import struct
+import sys
+from array import array
+from typing import (Dict, Iterable, Iterator, List, Optional, Sequence,
+                    Tuple)
+
+import homework
+
+MAGIC = b'RES1'
+HEADER = struct.Struct('<4sII')
+NAME_SIZE = struct.Struct('<H')
+# Числовые колонки в порядке хранения.
+COLUMNS = ('duration', 'distance', 'speed', 'calories')
+# Размеры номера в словаре и числа в колонке.
+TYPE_SIZE = 2
+ITEM_SIZE = 8
+
+
+def _padding(size: int) -> int:
+    """Вернуть количество байт для выравнивания до ITEM_SIZE."""
+    return -size % ITEM_SIZE
+
+
+def _in_range(indexes: Iterable[int],
+              column: Sequence[float],
+              low: Optional[float],
+              high: Optional[float]) -> Iterator[int]:
+    """Лениво отобрать номера, значения колонки по которым в границах."""
+    for index in indexes:
+        value = column[index]
+        if (low is None or value >= low) and (high is None or value <= high):
+            yield index
+
+
+class ResultStore:
+    """Колонки результатов тренировок со словарным кодированием типа."""
+
+    def __init__(self) -> None:
+        self.dictionary: List[str] = []
+        self._codes: Dict[str, int] = {}
+        self.types = array('H')
+        self.columns: Dict[str, Sequence[float]] = {
+            name: array('d') for name in COLUMNS}
+        self._mmap: Optional[mmap.mmap] = None
+        self._views: List[memoryview] = []
+
+    def __len__(self) -> int:
+        return len(self.types)
+
+    @property
+    def readonly(self) -> bool:
+        """Открыто ли хранилище из файла (только для чтения)."""
+        return self._mmap is not None
+
+    def _code(self, training_type: str) -> int:
+        code = self._codes.get(training_type)
+        if code is None:
+            if len(self.dictionary) > 0xFFFF:
+                raise ValueError('Слишком много видов тренировок')
+            code = self._codes[training_type] = len(self.dictionary)
+            self.dictionary.append(training_type)
+        return code
+
+    def extend_columns(self,
+                       training_types: Sequence[str],
+                       durations: Sequence[float],
+                       distances: Sequence[float],
+                       speeds: Sequence[float],
+                       calories: Sequence[float]) -> None:
+        """Добавить результаты колонками, например из ``compute_batch``."""
+        if self.readonly:
+            raise ValueError('Хранилище открыто только для чтения')
+        values = (durations, distances, speeds, calories)
+        if any(len(column) != len(training_types) for column in values):
+            raise ValueError('Колонки должны быть одинаковой длины')
+        self.types.extend(self._code(training_type)
+                          for training_type in training_types)
+        for name, column in zip(COLUMNS, values):
+            self.columns[name].extend(column)
+
+    def extend(self, messages: Iterable[homework.InfoMessage]) -> None:
+        """Добавить сообщения о тренировках."""
+        messages = list(messages)
+        self.extend_columns(
+            [info.training_type for info in messages],
+            *([getattr(info, name) for info in messages]
+              for name in COLUMNS))
+
+    def append(self, info: homework.InfoMessage) -> None:
+        """Добавить одно сообщение о тренировке."""
+        self.extend([info])
+
+    def __getitem__(self, index: int) -> homework.InfoMessage:
+        return homework.InfoMessage(
+            self.dictionary[self.types[index]],
+            *(self.columns[name][index] for name in COLUMNS))
+
+    def __iter__(self) -> Iterator[homework.InfoMessage]:
+        for index in range(len(self)):
+            yield self[index]
+
+    def select(self,
+               training_type: Optional[str] = None,
+               **ranges: Tuple[Optional[float], Optional[float]]
+               ) -> array:
+        """Вернуть номера записей, подходящих под условия.
+
+        ``ranges`` задают границы колонок включительно, например
+        ``calories=(100, None)``; ``None`` - граница не задана.
+        """
+        for name in ranges:
+            if name not in self.columns:
+                raise ValueError(f'Неизвестная колонка {name}')
+        if training_type is not None:
+            code = self._codes.get(training_type)
+            if code is None:
+                return array('L')
+            indexes: Iterable[int] = (index for index, value
+                                      in enumerate(self.types)
+                                      if value == code)
+        else:
+            indexes = range(len(self))
+        for name, (low, high) in ranges.items():
+            indexes = _in_range(indexes, self.columns[name], low, high)
+        return array('L', indexes)
+
+    def to_columns(self) -> Dict[str, object]:
+        """Вернуть буферы колонок в духе Arrow без копирования.
+
+        Тип тренировки отдается словарем: номера и список названий.
+        Пока буферы используются, хранилище нельзя расширять, а
+        открытое из файла - закрывать.
+        """
+        def buffer(column: Sequence) -> memoryview:
+            if isinstance(column, memoryview):
+                return column
+            return memoryview(column)
+
+        result: Dict[str, object] = {
+            'training_type': {'indices': buffer(self.types),
+                              'dictionary': list(self.dictionary)}}
+        for name in COLUMNS:
+            result[name] = buffer(self.columns[name])
+        return result
+
+    def save(self, path: str) -> None:
+        """Сохранить хранилище в файл."""
+        with open(path, 'wb') as file:
+            file.write(HEADER.pack(MAGIC, len(self), len(self.dictionary)))
+            for name in self.dictionary:
+                encoded = name.encode('utf-8')
+                file.write(NAME_SIZE.pack(len(encoded)) + encoded)
+            types = array('H', self.types)
+            columns = [array('d', self.columns[name]) for name in COLUMNS]
+            if sys.byteorder != 'little':
+                for column in (types, *columns):
+                    column.byteswap()
+            file.write(types.tobytes())
+            file.write(bytes(_padding(file.tell())))
+            for column in columns:
+                file.write(column.tobytes())
+
+    @classmethod
+    def open(cls, path: str) -> 'ResultStore':
+        """Открыть сохраненное хранилище через ``mmap`` для чтения."""
+        store = cls()
+        with open(path, 'rb') as file:
+            store._mmap = mmap.mmap(file.fileno(), 0,
+                                    access=mmap.ACCESS_READ)
+        try:
+            store._map_columns()
+        except (ValueError, struct.error):
+            store.close()
+            raise ValueError('Файл результатов поврежден')
+        return store
+
+    def _view(self, start: int, size: int, fmt: str) -> Sequence:
+        if sys.byteorder != 'little':
+            column = array(fmt, self._mmap[start:start + size])
+            column.byteswap()
+            return column
+        view = memoryview(self._mmap)[start:start + size]
+        column = view.cast(fmt)
+        self._views += [view, column]
+        return column
+
+    def _map_columns(self) -> None:
+        magic, count, names_count = HEADER.unpack_from(self._mmap)
+        if magic != MAGIC:
+            raise ValueError('Неизвестный формат файла результатов')
+        offset = HEADER.size
+        for _ in range(names_count):
+            (size,) = NAME_SIZE.unpack_from(self._mmap, offset)
+            offset += NAME_SIZE.size
+            name = self._mmap[offset:offset + size].decode('utf-8')
+            self._codes[name] = len(self.dictionary)
+            self.dictionary.append(name)
+            offset += size
+        end = offset + TYPE_SIZE * count
+        end += _padding(end)
+        if len(self._mmap) != end + len(COLUMNS) * ITEM_SIZE * count:
+            raise ValueError('Файл результатов поврежден')
+        self.types = self._view(offset, TYPE_SIZE * count, 'H')
+        offset = end
+        for name in COLUMNS:
+            self.columns[name] = self._view(offset, ITEM_SIZE * count, 'd')
+            offset += ITEM_SIZE * count
+
+    def close(self) -> None:
+        """Закрыть файл, открытый через ``open``."""
+        if self._mmap is None:
+            return
+        for view in reversed(self._views):
+            view.release()
+        self._views.clear()
+        self._mmap.close()
+        self._mmap = None
+
+    def __enter__(self) -> 'ResultStore':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
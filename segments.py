@@ -0,0 +1,75 @@
+"""Расчет тренировок по отрезкам (временным рядам с часов).
+
+Вместо общего количества действий и общей длительности тренировка
+задается колонками по отрезкам: количество шагов или гребков и
+длительность каждого отрезка. Дистанция, скорость и калории
+считаются для каждого отрезка колоночными формулами классов
+тренировок, а затем сводятся к обычному ``InfoMessage``.
+"""
+from itertools import repeat
+from numbers import Number
+from typing import List, Sequence, Tuple, Type, Union
+
+import homework
+
+Column = Union[float, Sequence[float]]
+
+
+class SegmentedTraining:
+    """Тренировка, заданная отрезками.
+
+    ``extras`` - дополнительные поля вида тренировки в порядке
+    параметров его ``__init__``: число для значения, общего для всех
+    отрезков (рост, длина бассейна), или колонка по отрезкам
+    (количество бассейнов). Колонки не копируются: подойдут списки,
+    ``array`` и ``memoryview``.
+    """
+
+    def __init__(self,
+                 workout_type: str,
+                 actions: Sequence[float],
+                 durations: Sequence[float],
+                 weight: float,
+                 *extras: Column) -> None:
+        try:
+            self.training_class: Type[homework.Training] = (
+                homework.TRAINING_CLASSES[workout_type])
+        except KeyError:
+            raise ValueError(f'Неопределенный тип тренировки {workout_type}')
+        if len(extras) != self.training_class.FIELDS_COUNT - 3:
+            raise ValueError(f'Тренировка {workout_type} ожидает '
+                             f'{self.training_class.FIELDS_COUNT - 3} '
+                             'дополнительных полей')
+        if not len(actions) or len(actions) != len(durations):
+            raise ValueError('Колонки отрезков должны быть непустыми '
+                             'и одинаковой длины')
+        for extra in extras:
+            if (not isinstance(extra, Number)
+                    and len(extra) != len(actions)):
+                raise ValueError('Колонки отрезков должны быть '
+                                 'одинаковой длины')
+        self.actions = actions
+        self.durations = durations
+        self.weight = weight
+        self.extras = extras
+
+    def get_segments(self) -> Tuple[List[float], List[float], List[float]]:
+        """Вернуть дистанцию, скорость и калории по каждому отрезку."""
+        extras = [repeat(extra) if isinstance(extra, Number) else extra
+                  for extra in self.extras]
+        return self.training_class.compute_metrics(
+            self.actions, self.durations, repeat(self.weight), extras)
+
+    def show_training_info(self) -> homework.InfoMessage:
+        """Вернуть сводное сообщение о тренировке."""
+        distances, speeds, calories = self.get_segments()
+        duration = sum(self.durations)
+        # Средняя скорость взвешивается по длительности отрезков.
+        speed = sum(segment_speed * segment_duration
+                    for segment_speed, segment_duration
+                    in zip(speeds, self.durations)) / duration
+        return homework.InfoMessage(self.training_class.__name__,
+                                    duration,
+                                    sum(distances),
+                                    speed,
+                                    sum(calories))
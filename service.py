@@ -0,0 +1,258 @@
+"""Сетевой сервис расчета тренировок на asyncio.
+
+Клиент отправляет пакеты построчно (``RUN 15000 1 75``) и получает
+в ответ по строке на каждый пакет: текст сообщения о тренировке или
+``ERROR <описание>``. Запросы всех клиентов, в том числе несколько
+строк одного клиента, собираются в небольшие пачки, которые
+проверяются и считаются за один проход.
+"""
+import argparse
+import asyncio
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import homework
+
+# Ответ сервиса на пакет, который не удалось обработать.
+ERROR_PREFIX = 'ERROR'
+
+
+def percentile(values: Sequence[float], percent: float) -> float:
+    """Вернуть перцентиль по методу ближайшего ранга."""
+    if not values:
+        raise ValueError('Нет значений для расчета перцентиля')
+    ordered = sorted(values)
+    rank = max(0, -(-len(ordered) * percent // 100) - 1)
+    return ordered[int(rank)]
+
+
+class TrainingService:
+    """Сервис, объединяющий одновременные запросы в пачки.
+
+    Пачка отправляется в расчет, когда в ней набралось ``max_batch``
+    пакетов или с момента первого пакета прошло ``max_delay`` секунд.
+    Пачка проверяется ``validate_packages`` и считается одним вызовом
+    ``compute_batch``.
+    """
+
+    def __init__(self, max_batch: int = 256, max_delay: float = 0.002
+                 ) -> None:
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.batches = 0
+        self._queue: Optional[asyncio.Queue] = None
+        self._batcher: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        """Запустить обработку пачек в текущем цикле событий."""
+        self._queue = asyncio.Queue()
+        self._batcher = asyncio.create_task(self._run_batches())
+
+    async def stop(self) -> None:
+        """Остановить обработку пачек и отменить ожидающие запросы."""
+        if self._batcher is not None:
+            self._batcher.cancel()
+            try:
+                await self._batcher
+            except asyncio.CancelledError:
+                pass
+            self._batcher = None
+        if self._queue is not None:
+            while not self._queue.empty():
+                _, future = self._queue.get_nowait()
+                future.cancel()
+            self._queue = None
+
+    async def submit(self, package: homework.Package
+                     ) -> homework.InfoMessage:
+        """Поставить пакет в очередь и дождаться результата."""
+        if self._queue is None:
+            raise RuntimeError('Сервис не запущен')
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((package, future))
+        return await future
+
+    async def _collect_batch(self, batch: List[Tuple[homework.Package,
+                                                     asyncio.Future]]
+                             ) -> None:
+        batch.append(await self._queue.get())
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.max_delay
+        while len(batch) < self.max_batch:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(),
+                                                    timeout))
+            except asyncio.TimeoutError:
+                break
+
+    async def _run_batches(self) -> None:
+        while True:
+            batch: List[Tuple[homework.Package, asyncio.Future]] = []
+            try:
+                await self._collect_batch(batch)
+            except asyncio.CancelledError:
+                for _, future in batch:
+                    future.cancel()
+                raise
+            self.batches += 1
+            self._process_batch([(package, future)
+                                 for package, future in batch
+                                 if not future.done()])
+
+    @staticmethod
+    def _process_batch(batch: List[Tuple[homework.Package,
+                                         asyncio.Future]]) -> None:
+        accepted, rejected = homework.validate_packages(
+            [package for package, _ in batch])
+        for index, _, reason in rejected:
+            batch[index][1].set_exception(ValueError(reason))
+        rejected_indexes = {index for index, _, _ in rejected}
+        futures = [future for index, (_, future) in enumerate(batch)
+                   if index not in rejected_indexes]
+        try:
+            messages = homework.compute_messages(accepted)
+        except Exception:
+            # Ошибку вызвал один из пакетов: считаем их по одному, чтобы
+            # она досталась только его запросу.
+            for future, (workout_type, data) in zip(futures, accepted):
+                try:
+                    training = homework.read_package(workout_type, data)
+                    info = training.show_training_info()
+                except Exception as error:
+                    future.set_exception(error)
+                else:
+                    future.set_result(info)
+            return
+        for future, info in zip(futures, messages):
+            future.set_result(info)
+
+    async def _respond(self, text: str) -> str:
+        try:
+            info = await self.submit(homework.parse_package(text))
+        except Exception as error:
+            return f'{ERROR_PREFIX} {error}'
+        return info.get_message()
+
+    @staticmethod
+    async def _send_replies(replies: asyncio.Queue,
+                            writer: asyncio.StreamWriter) -> None:
+        connected = True
+        while True:
+            task = await replies.get()
+            if task is None:
+                return
+            response = await task
+            if not connected:
+                continue
+            try:
+                writer.write(response.encode() + b'\n')
+                await writer.drain()
+            except ConnectionError:
+                connected = False
+
+    async def handle_client(self,
+                            reader: asyncio.StreamReader,
+                            writer: asyncio.StreamWriter) -> None:
+        """Обработать соединение клиента.
+
+        Строки читаются, не дожидаясь ответов на предыдущие, поэтому
+        запросы одного клиента тоже объединяются в пачки; ответы
+        отправляются в порядке строк. Ожидающих ответов не больше
+        ``max_batch`` на соединение.
+        """
+        replies: asyncio.Queue = asyncio.Queue(self.max_batch)
+        sender = asyncio.create_task(self._send_replies(replies, writer))
+        try:
+            async for line in reader:
+                text = line.decode().strip()
+                if text:
+                    await replies.put(
+                        asyncio.create_task(self._respond(text)))
+        finally:
+            await replies.put(None)
+            await sender
+            writer.close()
+
+    async def serve(self,
+                    host: Optional[str] = None,
+                    port: int = 0,
+                    path: Optional[str] = None) -> asyncio.AbstractServer:
+        """Запустить TCP-сервер или сервер на Unix-сокете ``path``."""
+        await self.start()
+        if path is not None:
+            return await asyncio.start_unix_server(self.handle_client, path)
+        return await asyncio.start_server(self.handle_client, host, port)
+
+
+async def run_load(host: str,
+                   port: int,
+                   line: str,
+                   requests: int = 1000,
+                   concurrency: int = 10) -> Dict[str, float]:
+    """Нагрузить сервис и вернуть задержки ответов в миллисекундах."""
+    latencies: List[float] = []
+
+    async def client(count: int) -> None:
+        reader, writer = await asyncio.open_connection(host, port)
+        try:
+            for _ in range(count):
+                started = time.perf_counter()
+                writer.write(line.encode() + b'\n')
+                await writer.drain()
+                await reader.readline()
+                latencies.append((time.perf_counter() - started) * 1000)
+        finally:
+            writer.close()
+            await writer.wait_closed()
+
+    base, extra = divmod(requests, concurrency)
+    started = time.perf_counter()
+    await asyncio.gather(*(client(base + (index < extra))
+                           for index in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    return {'requests': len(latencies),
+            'rps': len(latencies) / elapsed,
+            'p50': percentile(latencies, 50),
+            'p99': percentile(latencies, 99)}
+
+
+async def serve_forever(args: argparse.Namespace) -> None:
+    """Запустить сервис и обслуживать клиентов до остановки."""
+    service = TrainingService(args.max_batch, args.max_delay)
+    server = await service.serve(args.host, args.port, args.unix)
+    async with server:
+        await server.serve_forever()
+
+
+def main() -> None:
+    """Главная функция."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    commands = parser.add_subparsers(dest='command', required=True)
+    serve = commands.add_parser('serve', help='запустить сервис')
+    serve.add_argument('--host', default='127.0.0.1')
+    serve.add_argument('--port', type=int, default=8765)
+    serve.add_argument('--unix', help='путь к Unix-сокету')
+    serve.add_argument('--max-batch', type=int, default=256)
+    serve.add_argument('--max-delay', type=float, default=0.002)
+    load = commands.add_parser('load', help='измерить задержки сервиса')
+    load.add_argument('--host', default='127.0.0.1')
+    load.add_argument('--port', type=int, default=8765)
+    load.add_argument('--requests', type=int, default=10_000)
+    load.add_argument('--concurrency', type=int, default=50)
+    load.add_argument('--package', default='RUN 15000 1 75')
+    args = parser.parse_args()
+    if args.command == 'serve':
+        asyncio.run(serve_forever(args))
+        return
+    result = asyncio.run(run_load(args.host, args.port, args.package,
+                                  args.requests, args.concurrency))
+    print(f'Запросов: {result["requests"]}; '
+          f'в секунду: {result["rps"]:.0f}; '
+          f'p50: {result["p50"]:.3f} мс; p99: {result["p99"]:.3f} мс')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,241 @@
+"""Потоковая статистика по результатам тренировок.
+
+Для каждого вида тренировки и показателя (калории, скорость) ведутся
+минимум, максимум, среднее и дисперсия по алгоритму Уэлфорда, а
+перцентили оцениваются скетчем с логарифмическими корзинами
+(DDSketch) с заданной относительной погрешностью. Состояния можно
+объединять между процессами и сохранять в компактный двоичный вид.
+"""
+import math
+import struct
+from typing import Dict, Iterable, Optional, Tuple
+
+import homework
+
+# Показатели сообщения, по которым собирается статистика.
+METRICS = ('calories', 'speed')
+MOMENTS = struct.Struct('<Qdddd')
+SKETCH_HEADER = struct.Struct('<dQI')
+STATS_HEADER = struct.Struct('<dI')
+BUCKET = struct.Struct('<iQ')
+NAME_SIZE = struct.Struct('<H')
+BLOCK_SIZE = struct.Struct('<I')
+
+
+class RunningStats:
+    """Количество, минимум, максимум, среднее и дисперсия потока."""
+
+    __slots__ = ('count', 'mean', 'm2', 'minimum', 'maximum')
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.minimum = math.inf
+        self.maximum = -math.inf
+
+    def add(self, value: float) -> None:
+        """Учесть значение."""
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        self.minimum = min(self.minimum, value)
+        self.maximum = max(self.maximum, value)
+
+    def merge(self, other: 'RunningStats') -> None:
+        """Объединить с состоянием, собранным в другом процессе."""
+        if not other.count:
+            return
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta * delta * self.count * other.count / count
+        self.count = count
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+
+    @property
+    def variance(self) -> float:
+        """Выборочная дисперсия."""
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    def to_bytes(self) -> bytes:
+        """Вернуть состояние в двоичном виде."""
+        return MOMENTS.pack(self.count, self.mean, self.m2,
+                            self.minimum, self.maximum)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'RunningStats':
+        """Восстановить состояние из ``to_bytes``."""
+        stats = cls()
+        (stats.count, stats.mean, stats.m2,
+         stats.minimum, stats.maximum) = MOMENTS.unpack(data)
+        return stats
+
+
+class QuantileSketch:
+    """Скетч перцентилей с относительной погрешностью ``accuracy``.
+
+    Положительное значение ``x`` попадает в корзину
+    ``ceil(log(x) / log(gamma))``, где ``gamma = (1 + a) / (1 - a)``;
+    оценка перцентиля отличается от точного значения не более чем
+    на долю ``a``. Отрицательных значений у показателей тренировок
+    нет, поэтому они не поддерживаются.
+    """
+
+    def __init__(self, accuracy: float = 0.01) -> None:
+        if not 0 < accuracy < 1:
+            raise ValueError('Погрешность должна быть в интервале (0, 1)')
+        self.accuracy = accuracy
+        self.gamma = (1 + accuracy) / (1 - accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.zero_count = 0
+        self.buckets: Dict[int, int] = {}
+
+    @property
+    def count(self) -> int:
+        """Количество учтенных значений."""
+        return self.zero_count + sum(self.buckets.values())
+
+    def add(self, value: float) -> None:
+        """Учесть значение."""
+        if value < 0 or math.isnan(value):
+            raise ValueError('Скетч принимает только неотрицательные '
+                             'значения')
+        if value == 0:
+            self.zero_count += 1
+            return
+        index = math.ceil(math.log(value) / self._log_gamma)
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+
+    def merge(self, other: 'QuantileSketch') -> None:
+        """Объединить со скетчем с той же погрешностью."""
+        if other.accuracy != self.accuracy:
+            raise ValueError('Нельзя объединить скетчи с разной '
+                             'погрешностью')
+        self.zero_count += other.zero_count
+        for index, count in other.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0) + count
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Оценить квантиль ``q`` из [0, 1] или вернуть ``None``."""
+        if not 0 <= q <= 1:
+            raise ValueError('Квантиль должен быть в интервале [0, 1]')
+        count = self.count
+        if not count:
+            return None
+        rank = q * (count - 1)
+        seen = self.zero_count
+        if rank < seen:
+            return 0.0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if rank < seen:
+                return 2 * self.gamma ** index / (self.gamma + 1)
+        return None
+
+    def to_bytes(self) -> bytes:
+        """Вернуть состояние в двоичном виде."""
+        return (SKETCH_HEADER.pack(self.accuracy, self.zero_count,
+                                   len(self.buckets))
+                + b''.join(BUCKET.pack(index, count)
+                           for index, count in sorted(self.buckets.items())))
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'QuantileSketch':
+        """Восстановить состояние из ``to_bytes``."""
+        accuracy, zero_count, size = SKETCH_HEADER.unpack_from(data)
+        sketch = cls(accuracy)
+        sketch.zero_count = zero_count
+        sketch.buckets = dict(BUCKET.iter_unpack(
+            data[SKETCH_HEADER.size:SKETCH_HEADER.size + BUCKET.size * size]))
+        return sketch
+
+
+class WorkoutStats:
+    """Статистика показателей по видам тренировок."""
+
+    def __init__(self, accuracy: float = 0.01) -> None:
+        self.accuracy = accuracy
+        self.stats: Dict[Tuple[str, str],
+                         Tuple[RunningStats, QuantileSketch]] = {}
+
+    def _get(self, training_type: str,
+             metric: str) -> Tuple[RunningStats, QuantileSketch]:
+        key = (training_type, metric)
+        if key not in self.stats:
+            self.stats[key] = (RunningStats(),
+                               QuantileSketch(self.accuracy))
+        return self.stats[key]
+
+    def add(self, info: homework.InfoMessage) -> None:
+        """Учесть сообщение ``show_training_info``."""
+        for metric in METRICS:
+            value = getattr(info, metric)
+            moments, sketch = self._get(info.training_type, metric)
+            moments.add(value)
+            sketch.add(value)
+
+    def extend(self, messages: Iterable[homework.InfoMessage]) -> None:
+        """Учесть поток сообщений."""
+        for info in messages:
+            self.add(info)
+
+    def merge(self, other: 'WorkoutStats') -> None:
+        """Объединить со статистикой другого процесса."""
+        for (training_type, metric), (moments, sketch) in other.stats.items():
+            own_moments, own_sketch = self._get(training_type, metric)
+            own_moments.merge(moments)
+            own_sketch.merge(sketch)
+
+    def summary(self) -> Dict[str, Dict[str, Dict[str, Optional[float]]]]:
+        """Вернуть сводку: вид тренировки -> показатель -> значения."""
+        result: Dict[str, Dict[str, Dict[str, Optional[float]]]] = {}
+        for (training_type, metric), (moments, sketch) in self.stats.items():
+            result.setdefault(training_type, {})[metric] = {
+                'count': moments.count,
+                'min': moments.minimum,
+                'max': moments.maximum,
+                'mean': moments.mean,
+                'variance': moments.variance,
+                'p50': sketch.quantile(0.5),
+                'p95': sketch.quantile(0.95),
+                'p99': sketch.quantile(0.99),
+            }
+        return result
+
+    def to_bytes(self) -> bytes:
+        """Вернуть состояние в двоичном виде."""
+        parts = [STATS_HEADER.pack(self.accuracy, len(self.stats))]
+        for (training_type, metric), (moments, sketch) in self.stats.items():
+            for name in (training_type, metric):
+                encoded = name.encode('utf-8')
+                parts.append(NAME_SIZE.pack(len(encoded)) + encoded)
+            parts.append(moments.to_bytes())
+            sketch_bytes = sketch.to_bytes()
+            parts.append(BLOCK_SIZE.pack(len(sketch_bytes)) + sketch_bytes)
+        return b''.join(parts)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'WorkoutStats':
+        """Восстановить состояние из ``to_bytes``."""
+        accuracy, size = STATS_HEADER.unpack_from(data)
+        result = cls(accuracy)
+        offset = STATS_HEADER.size
+        for _ in range(size):
+            names = []
+            for _ in range(2):
+                (length,) = NAME_SIZE.unpack_from(data, offset)
+                offset += NAME_SIZE.size
+                names.append(data[offset:offset + length].decode('utf-8'))
+                offset += length
+            moments = RunningStats.from_bytes(
+                data[offset:offset + MOMENTS.size])
+            offset += MOMENTS.size
+            (length,) = BLOCK_SIZE.unpack_from(data, offset)
+            offset += BLOCK_SIZE.size
+            sketch = QuantileSketch.from_bytes(data[offset:offset + length])
+            offset += length
+            result.stats[(names[0], names[1])] = (moments, sketch)
+        return result
@@ -0,0 +1,40 @@
+import pytest
+
+import aggregation
+import homework
+
+RUN = homework.InfoMessage('Running', 1, 9.75, 9.75, 699.75)
+WLK = homework.InfoMessage('SportsWalking', 2, 5.85, 2.925, 300)
+
+
+def test_totals():
+    aggregator = aggregation.Aggregator()
+    aggregator.add('user', RUN)
+    aggregator.add('user', WLK)
+    aggregator.add('user', homework.read_package('RUN', [15000, 1, 75]))
+    aggregator.add('other', RUN)
+    totals = aggregator.totals('user')
+    assert totals.count == 3
+    assert totals.duration == 4
+    assert totals.distance == pytest.approx(25.35)
+    assert totals.mean_speed == pytest.approx(25.35 / 4)
+    assert aggregator.totals('user', 'Running').count == 2
+    assert aggregator.totals('other').count == 1
+    assert aggregator.totals('nobody').as_dict()['mean_speed'] == 0
+
+
+def test_window_totals():
+    aggregator = aggregation.Aggregator(window=60)
+    aggregator.add('user', RUN, timestamp=0)
+    aggregator.add('user', WLK, timestamp=30)
+    assert aggregator.window_totals('user', now=59).count == 2
+    window = aggregator.window_totals('user', now=60)
+    assert window.count == 1
+    assert window.calories == pytest.approx(300)
+    assert aggregator.window_totals('user', 'Running', now=60).count == 0
+    assert aggregator.totals('user').count == 2
+
+
+def test_window_not_configured():
+    with pytest.raises(ValueError):
+        aggregation.Aggregator().window_totals('user')
@@ -0,0 +1,59 @@
+import json
+
+import benchmark
+
+
+def test_run_benchmarks():
+    results = benchmark.run_benchmarks(batch_sizes=[1, 3], repeat=1)
+    names = {item['name'] for item in results}
+    for class_name in benchmark.PACKAGES:
+        for operation in ['read_package', 'get_distance', 'get_mean_speed',
+                          'get_spent_calories', 'show_training_info',
+                          'get_message', 'message_pipeline']:
+            assert f'{class_name}.{operation}' in names
+    assert {item['batch_size'] for item in results} == {1, 3}
+
+
+def test_main_writes_json(tmp_path):
+    path = tmp_path / 'result.json'
+    benchmark.main(['--batch-sizes', '2', '--repeat', '1', '--count', '10',
+                    '--json', str(path)])
+    data = json.loads(path.read_text(encoding='utf-8'))
+    assert data['results']
+    ratios = benchmark.compare(data['results'], data['results'])
+    assert set(ratios.values()) == {1.0}
+
+
+def test_thread_scaling():
+    result = benchmark.thread_scaling(packages_count=30, threads=[1, 2])
+    assert set(result) == {1, 2}
+    assert all(rate > 0 for rate in result.values())
+
+
+def test_synthetic_packages():
+    packages = benchmark.synthetic_packages(50, seed=1)
+    assert packages == benchmark.synthetic_packages(50, seed=1)
+    for workout_type, data in packages:
+        assert benchmark.homework.validate_package(workout_type,
+                                                   data) is None
+
+
+def test_profile_memory():
+    profile = benchmark.profile_memory(300)
+    assert profile['peak_bytes'] > 0
+    assert profile['bytes_per_workout'] > 0
+    assert set(profile['bytes_per_workout_by_stage']) == {
+        'packages', 'read_package', 'show_training_info', 'get_message'}
+    types = profile['objects_by_type']
+    assert types['InfoMessage'] == 300
+    assert sum(types[name] for name in benchmark.PACKAGES) == 300
+    assert types['dict'] >= 300, 'Должны учитываться __dict__ тренировок.'
+    assert types['str'] >= 300 and types['float'] >= 300
+    assert 'type' not in types and 'module' not in types
+    assert profile['top_allocations']
+
+
+def test_memory_report_slots_smaller():
+    report = benchmark.memory_report(500)
+    for name in ['Running', 'SportsWalking', 'Swimming']:
+        assert report[f'{name} (slots)'] < report[f'{name} (dict)']
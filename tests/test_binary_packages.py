@@ -0,0 +1,89 @@
+import pytest
+
+import binary_packages
+import homework
+
+PACKAGES = [
+    ('SWM', [720, 1, 80, 25, 40]),
+    ('RUN', [15000, 1, 75]),
+    ('WLK', [9000, 1, 75, 180]),
+    ('RUN', [1206, 12, 6]),
+    ('WLK', [3000.33, 2.512, 75.8, 180.1]),
+]
+
+
+@pytest.fixture
+def packages_path(tmp_path):
+    path = tmp_path / 'packages.bin'
+    with open(path, 'wb') as file:
+        count = binary_packages.write_packages(file, PACKAGES)
+    assert count == len(PACKAGES)
+    return str(path)
+
+
+def test_read_columns(packages_path):
+    with binary_packages.BinaryPackages(packages_path) as packages:
+        assert len(packages) == len(PACKAGES)
+        assert packages.workout_types == [code for code, _ in PACKAGES]
+        assert list(packages.actions) == [data[0] for _, data in PACKAGES]
+        assert list(packages.extras[0]) == [25, 0, 180, 0, 180.1]
+        assert list(packages.extras[1]) == [40, 0, 0, 0, 0]
+
+
+def test_compute_matches_read_package(packages_path):
+    with binary_packages.BinaryPackages(packages_path) as packages:
+        distances, speeds, calories = packages.compute()
+    for index, (workout_type, data) in enumerate(PACKAGES):
+        training = homework.read_package(workout_type, data)
+        assert distances[index] == training.get_distance()
+        assert speeds[index] == training.get_mean_speed()
+        assert calories[index] == training.get_spent_calories()
+
+
+@pytest.mark.parametrize('packages', [
+    PACKAGES[1:4],
+    [('RUN', [15000, 1, 75]), ('RUN', [1206, 12, 6])],
+    [('WLK', [9000, 1, 75, 180])] * 3,
+])
+def test_columns_aligned(tmp_path, packages):
+    path = tmp_path / 'packages.bin'
+    with open(path, 'wb') as file:
+        binary_packages.write_packages(file, packages)
+    size = path.stat().st_size
+    columns_size = binary_packages.COLUMNS_COUNT * 8 * len(packages)
+    assert (size - columns_size) % binary_packages.ITEM_SIZE == 0, (
+        'Колонки должны начинаться со смещения, кратного 8.'
+    )
+    with binary_packages.BinaryPackages(str(path)) as binary:
+        assert list(binary.weights) == [data[2] for _, data in packages]
+        distances, speeds, calories = binary.compute()
+        assert list(calories) == [
+            homework.read_package(*package).get_spent_calories()
+            for package in packages]
+
+
+def test_bad_file(tmp_path):
+    path = tmp_path / 'bad.bin'
+    path.write_bytes(b'NOPE' + bytes(64))
+    with pytest.raises(ValueError):
+        binary_packages.BinaryPackages(str(path))
+
+
+def test_write_rejects_long_package(tmp_path):
+    with open(tmp_path / 'packages.bin', 'wb') as file:
+        with pytest.raises(ValueError):
+            binary_packages.write_packages(file, [('RUN', [1] * 6)])
+
+
+@pytest.mark.parametrize('package', [
+    ('RUN', [15000, 1]),
+    ('WLK', [9000, 1, 75]),
+    ('SWM', [720, 1, 80, 25]),
+    ('XXX', [1, 1, 1]),
+    ('RUN', [15000, 0, 75]),
+])
+def test_write_rejects_invalid_package(tmp_path, package):
+    with open(tmp_path / 'packages.bin', 'wb') as file:
+        with pytest.raises(ValueError):
+            binary_packages.write_packages(file, [('RUN', [15000, 1, 75]),
+                                                  package])
@@ -0,0 +1,62 @@
+import cli
+
+
+def test_run_packages_and_files(tmp_path, capsys):
+    path = tmp_path / 'packages.txt'
+    path.write_text('SWM 720 1 80 25 40\n\nWLK 9000 1 75 180\n',
+                    encoding='utf-8')
+    assert cli.run(['--timing', 'RUN 1206 12 6', '-f', str(path)]) == 0
+    captured = capsys.readouterr()
+    assert captured.out.splitlines() == [
+        'Тип тренировки: Running; '
+        'Длительность: 12.000 ч.; '
+        'Дистанция: 0.784 км; '
+        'Ср. скорость: 0.065 км/ч; '
+        'Потрачено ккал: 12.812.',
+        'Тип тренировки: Swimming; '
+        'Длительность: 1.000 ч.; '
+        'Дистанция: 0.994 км; '
+        'Ср. скорость: 1.000 км/ч; '
+        'Потрачено ккал: 336.000.',
+        'Тип тренировки: SportsWalking; '
+        'Длительность: 1.000 ч.; '
+        'Дистанция: 5.850 км; '
+        'Ср. скорость: 5.850 км/ч; '
+        'Потрачено ккал: 349.252.',
+    ]
+    assert 'пакетов: 3' in captured.err
+
+
+def test_run_stdin(monkeypatch, capsys):
+    monkeypatch.setattr('sys.stdin', iter(['RUN 15000 1 75\n']))
+    assert cli.run([]) == 0
+    assert capsys.readouterr().out.startswith('Тип тренировки: Running;')
+
+
+def test_run_unknown_type(capsys):
+    assert cli.run(['SW1 720 1 80 25 40']) == 1
+    assert 'SW1' in capsys.readouterr().err
+
+
+def test_run_invalid_package(capsys):
+    assert cli.run(['RUN 15000 0 75']) == 1
+    assert capsys.readouterr().err.startswith(
+        'Ошибка: пакет RUN [15000, 0, 75]: '
+        'поле duration должно быть больше нуля')
+
+
+def test_run_missing_file(tmp_path, capsys):
+    assert cli.run(['-f', str(tmp_path / 'missing.txt')]) == 1
+    assert capsys.readouterr().err.startswith('Ошибка: ')
+
+
+def test_run_formats(capsys):
+    assert cli.run(['--format', 'csv', 'RUN 15000 1 75']) == 0
+    assert capsys.readouterr().out.splitlines() == [
+        'training_type,duration,distance,speed,calories',
+        'Running,1,9.75,9.75,797.805',
+    ]
+    assert cli.run(['--format', 'jsonl', 'RUN 15000 1 75']) == 0
+    assert capsys.readouterr().out.startswith('{"training_type": "Running"')
+    assert cli.run(['--format', 'xml', 'RUN 15000 1 75']) == 1
+    assert 'xml' in capsys.readouterr().err
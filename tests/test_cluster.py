@@ -0,0 +1,76 @@
+import os
+import sys
+
+import pytest
+
+import cluster
+import homework
+
+RECORDS = [
+    (1, 'RUN', [15000, 1, 75]),
+    (2, 'WLK', [9000, 1, 75, 180]),
+    (1, 'SWM', [720, 1, 80, 25, 40]),
+    (3, 'RUN', [1206, 12, 6]),
+    (2, 'WLK', [3000.33, 2.512, 75.8, 180.1]),
+    (4, 'SWM', [420, 4, 20, 42, 4]),
+]
+
+
+@pytest.mark.parametrize('by', ['user', 'workout_type'])
+def test_partition(by):
+    shards = cluster.partition(RECORDS, 3, by)
+    assert sorted(index for shard in shards for index in shard) == list(
+        range(len(RECORDS)))
+    assert shards == cluster.partition(RECORDS, 3, by)
+    key = 0 if by == 'user' else 1
+    for shard in shards:
+        for other in shards:
+            if shard is not other:
+                assert not ({RECORDS[i][key] for i in shard}
+                            & {RECORDS[i][key] for i in other})
+
+
+# Рабочий, который аварийно завершается на первом шарде, если еще
+# нет файла-метки, а затем работает как обычный.
+CRASHING_WORKER = '''
+import os
+import sys
+
+sys.path.insert(0, {root!r})
+import cluster
+
+if not os.path.exists({marker!r}):
+    open({marker!r}, 'w').close()
+    sys.stdin.readline()
+    os._exit(1)
+cluster.run_worker(sys.stdin, sys.stdout)
+'''
+
+
+def test_run_sharded_matches_serial(tmp_path):
+    script = tmp_path / 'worker.py'
+    script.write_text(CRASHING_WORKER.format(
+        root=os.path.dirname(os.path.abspath(cluster.__file__)),
+        marker=str(tmp_path / 'failed')), encoding='utf-8')
+    messages, totals = cluster.run_sharded(
+        RECORDS, shards=3, workers=2, command=[sys.executable, str(script)])
+    expected = homework.process_packages(
+        (workout_type, data) for _, workout_type, data in RECORDS)
+    assert messages == expected
+    assert (tmp_path / 'failed').exists(), 'Шард должен быть повторен.'
+    assert totals['Running']['count'] == 2
+    assert totals['Swimming']['distance'] == pytest.approx(
+        expected[2].distance + expected[5].distance)
+
+
+def test_run_sharded_data_error():
+    with pytest.raises(RuntimeError, match='SW1'):
+        cluster.run_sharded([(1, 'SW1', [720, 1, 80, 25, 40])],
+                            shards=1, workers=1)
+
+
+def test_run_sharded_retries_exhausted():
+    command = [sys.executable, '-c', 'import sys; sys.stdin.readline()']
+    with pytest.raises(RuntimeError, match='Рабочий завершился'):
+        cluster.run_sharded(RECORDS, shards=2, workers=1, retries=1,
+                            command=command)
@@ -0,0 +1,71 @@
+import pytest
+
+import differential
+import homework
+
+
+@pytest.fixture(scope='module')
+def corpus():
+    return differential.generate_corpus(3000, seed=42)
+
+
+def test_reference_matches_golden_values():
+    info = differential.reference_info('WLK', [9000, 1.5, 75, 180])
+    assert differential.reference_message(info) == (
+        'Тип тренировки: SportsWalking; '
+        'Длительность: 1.500 ч.; '
+        'Дистанция: 5.850 км; '
+        'Ср. скорость: 3.900 км/ч; '
+        'Потрачено ккал: 364.084.'
+    )
+
+
+def test_corpus_contains_golden_and_grid_packages(corpus):
+    assert corpus[:len(differential.GOLDEN_PACKAGES)] == (
+        differential.GOLDEN_PACKAGES)
+    assert ('RUN', [250, 1, 75]) in corpus
+    assert ('WLK', [20_000, 3, 120, 180]) in corpus
+    assert len(corpus) == (len(differential.GOLDEN_PACKAGES)
+                           + len(differential.integer_grid()) + 3000)
+
+
+def test_harness_detects_reordered_formula():
+    def reordered_engine(packages):
+        return [homework.InfoMessage(
+            info.training_type, info.duration, info.distance, info.speed,
+            (18 * info.speed + 1.79) * data[2] * info.duration * 0.06)
+            for info, (_, data) in zip(
+                homework.process_packages(packages), packages)]
+
+    result = differential.compare([('RUN', [250, 1, 75])],
+                                  {'reordered': reordered_engine})
+    assert result['reordered']['format_mismatches'] == 1
+
+
+def test_engines_match_reference(corpus):
+    report = differential.compare(corpus)
+    assert set(report) == set(differential.ENGINES)
+    for name, result in report.items():
+        assert result['format_mismatches'] == 0, result['examples']
+        assert result['type_mismatches'] == 0
+        for field, drift in result['drift'].items():
+            assert drift['abs'] == 0, f'{name}: расхождение в {field}'
+
+
+def test_harness_detects_drift(corpus):
+    def broken_engine(packages):
+        return [homework.InfoMessage(info.training_type, info.duration,
+                                     info.distance, info.speed,
+                                     info.calories * (1 + 1e-5))
+                for info in homework.process_packages(packages)]
+
+    result = differential.compare(corpus, {'broken': broken_engine})
+    assert result['broken']['format_mismatches'] > 0
+    assert result['broken']['drift']['calories']['rel'] == pytest.approx(
+        1e-5)
+    assert len(result['broken']['examples']) == 3
+
+
+def test_main(capsys):
+    assert differential.main(['--count', '200', '--engine', 'batch']) == 0
+    assert 'batch' in capsys.readouterr().out
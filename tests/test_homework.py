@@ -1,7 +1,12 @@
+import io
 import re
 import pytest
+from decimal import Decimal
+from fractions import Fraction
 import types
 import inspect
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from conftest import Capturing
 
 try:
@@ -419,3 +424,486 @@ def test_main_output(input_data, expected):
     assert get_message_output == expected, (
         'Метод `main` должен печатать результат в консоль.\n'
     )
+
+
+@pytest.mark.parametrize('packages', [
+    [('SWM', [720, 1, 80, 25, 40]),
+     ('RUN', [15000, 1, 75]),
+     ('WLK', [9000, 1, 75, 180]),
+     ('RUN', [1206, 12, 6]),
+     ('WLK', [3000.33, 2.512, 75.8, 180.1]),
+     ('SWM', [420, 4, 20, 42, 4])],
+])
+def test_compute_batch(packages):
+    assert hasattr(homework, 'compute_batch'), (
+        'Создайте функцию `compute_batch` для расчета пачки тренировок.'
+    )
+    workout_types = [workout_type for workout_type, _ in packages]
+    actions = [data[0] for _, data in packages]
+    durations = [data[1] for _, data in packages]
+    weights = [data[2] for _, data in packages]
+    extras = [[data[3] if len(data) > 3 else 0 for _, data in packages],
+              [data[4] if len(data) > 4 else 0 for _, data in packages]]
+    distances, speeds, calories = homework.compute_batch(
+        workout_types, actions, durations, weights, extras)
+    for index, (workout_type, data) in enumerate(packages):
+        training = homework.read_package(workout_type, data)
+        assert distances[index] == training.get_distance(), (
+            'Дистанция в `compute_batch` должна совпадать с `get_distance`'
+        )
+        assert speeds[index] == training.get_mean_speed(), (
+            'Скорость в `compute_batch` должна совпадать с `get_mean_speed`'
+        )
+        assert calories[index] == training.get_spent_calories(), (
+            'Калории в `compute_batch` должны совпадать '
+            'с `get_spent_calories`'
+        )
+
+
+def test_compute_batch_unknown_type():
+    with pytest.raises(ValueError):
+        homework.compute_batch(['SW1'], [720], [1], [80])
+
+
+@pytest.mark.parametrize('input_data, expected', [
+    ('RUN 15000 1 75', ('RUN', [15000, 1, 75])),
+    ('WLK 3000.33 2.512 75.8 180.1\n',
+     ('WLK', [3000.33, 2.512, 75.8, 180.1])),
+])
+def test_parse_package(input_data, expected):
+    assert homework.parse_package(input_data) == expected, (
+        'Функция `parse_package` должна возвращать код тренировки '
+        'и список данных.'
+    )
+
+
+def test_stream_training_info():
+    source = io.StringIO(
+        '# код действия длительность вес ...\n'
+        'SWM 720 1 80 25 40\n'
+        '\n'
+        'RUN 1206 12 6\n'
+        'WLK 9000 1 75 180\n'
+    )
+    result = list(homework.stream_messages(source, chunk_size=2))
+    assert result == [
+        'Тип тренировки: Swimming; '
+        'Длительность: 1.000 ч.; '
+        'Дистанция: 0.994 км; '
+        'Ср. скорость: 1.000 км/ч; '
+        'Потрачено ккал: 336.000.',
+        'Тип тренировки: Running; '
+        'Длительность: 12.000 ч.; '
+        'Дистанция: 0.784 км; '
+        'Ср. скорость: 0.065 км/ч; '
+        'Потрачено ккал: 12.812.',
+        'Тип тренировки: SportsWalking; '
+        'Длительность: 1.000 ч.; '
+        'Дистанция: 5.850 км; '
+        'Ср. скорость: 5.850 км/ч; '
+        'Потрачено ккал: 349.252.',
+    ], 'Поток пакетов должен обрабатываться в исходном порядке.'
+
+
+def test_stream_chunks_is_lazy():
+    consumed = []
+
+    def source():
+        for _ in range(10):
+            consumed.append(1)
+            yield ('RUN', [15000, 1, 75])
+
+    chunks = homework.stream_chunks(source(), chunk_size=3)
+    assert len(next(chunks)) == 3
+    assert len(consumed) <= 4, (
+        'Пакеты должны читаться из источника порциями, а не целиком.'
+    )
+    assert [len(chunk) for chunk in chunks] == [3, 3, 1]
+
+
+def test_InfoMessage_is_compact():
+    info_message = homework.InfoMessage('Running', 1, 9.75, 9.75, 699.75)
+    assert not hasattr(info_message, '__dict__'), (
+        'Экземпляры `InfoMessage` не должны хранить `__dict__`.'
+    )
+    assert 'MESSAGE' not in inspect.signature(homework.InfoMessage).parameters
+    with pytest.raises(AttributeError):
+        info_message.calories = 0
+
+
+@pytest.mark.parametrize('input_data', [
+    ['Swimming', 1, 75, 1, 80],
+    ['Running', 4.12345, 20.0005, 4.9999, 20.0004],
+    ['SportsWalking', 2.512, 1.9502145, 0.7763592, 408.4290137],
+    ['Running', 1e-9, 1e12, float('inf'), -0.0004],
+])
+def test_InfoMessage_get_message_matches_template(input_data):
+    info_message = homework.InfoMessage(*input_data)
+    expected = homework.InfoMessage.MESSAGE.format(
+        **dict(zip(homework.InfoMessage.FIELDS, input_data)))
+    assert info_message.get_message() == expected, (
+        'Быстрое форматирование должно совпадать с шаблоном `MESSAGE`.'
+    )
+
+
+def test_format_messages():
+    messages = [homework.InfoMessage('Swimming', 1, 75, 1, 80),
+                homework.InfoMessage('Running', 4, 20, 4, 20)]
+    result = homework.format_messages(messages)
+    assert result == ''.join(
+        info.get_message() + '\n' for info in messages
+    ), '`format_messages` должна выводить по сообщению в строке.'
+    assert homework.format_messages([]) == ''
+
+
+@pytest.mark.parametrize('template', [
+    '{calories:>10}', '{calories!r}', '{calories:.3}',
+])
+def test_compile_template_rejects_unsupported(template):
+    with pytest.raises(ValueError):
+        homework.compile_template(template)
+
+
+@pytest.mark.parametrize('min_parallel', [0, 1000])
+def test_process_packages_parallel(min_parallel):
+    packages = [
+        ('SWM', [720, 1, 80, 25, 40]),
+        ('RUN', [15000, 1, 75]),
+        ('WLK', [9000, 1, 75, 180]),
+    ] * 5
+    result = homework.process_packages_parallel(
+        packages, workers=2, chunk_size=4, min_parallel=min_parallel)
+    assert result == homework.process_packages(packages), (
+        'Параллельная обработка должна сохранять порядок пакетов.'
+    )
+
+
+@pytest.mark.parametrize('workout_type, data', [
+    ('RUN', [9000, 1, 75]),
+    ('RUN', [1206, 12, 6]),
+    ('RUN', [3000.33, 2.512, 75.8]),
+    ('RUN', [250, 1, 75]),
+    ('RUN', [0, 1.5, 75]),
+    ('RUN', [500, 0.25, 90]),
+    ('WLK', [9000, 1.5, 75, 180]),
+    ('WLK', [3000.33, 2.512, 75.8, 180.1]),
+    ('SWM', [720, 1, 80, 25, 40]),
+    ('SWM', [1206, 12, 6, 12, 6]),
+])
+def test_calories_keep_formulas(workout_type, data):
+    action, duration, weight, *extra = data
+    distance = action * (1.38 if workout_type == 'SWM' else 0.65) / 1000
+    if workout_type == 'SWM':
+        speed = extra[0] * extra[1] / 1000 / duration
+        expected = (speed + 1.1) * 2 * weight * duration
+    elif workout_type == 'RUN':
+        speed = distance / duration
+        expected = (18 * speed + 1.79) * weight / 1000 * (duration * 60)
+    else:
+        speed = distance / duration
+        expected = ((0.035 * weight
+                     + ((speed * 0.278)**2 / (extra[0] / 100))
+                     * 0.029 * weight) * (duration * 60))
+    training = homework.read_package(workout_type, data)
+    assert training.get_spent_calories() == expected, (
+        'Порядок операций в формуле калорий не должен меняться.'
+    )
+    extras = [[value] for value in extra]
+    _, _, calories = homework.compute_batch(
+        [workout_type], [action], [duration], [weight], extras)
+    assert calories[0] == expected
+
+
+def test_PackageCache():
+    cache = homework.PackageCache(capacity=2)
+    data = [15000, 1, 75]
+    first = cache.get_info('RUN', data)
+    data[0] = 1
+    assert cache.get_info('RUN', [15000, 1, 75]) is first, (
+        'Повторный пакет должен возвращаться из кэша.'
+    )
+    assert cache.get_message('RUN', [15000, 1, 75]) == first.get_message()
+    assert cache.stats()['hits'] == 2 and cache.stats()['misses'] == 1
+    with pytest.raises(AttributeError):
+        first.calories = 0
+    cache.get_info('WLK', [9000, 1, 75, 180])
+    cache.get_info('SWM', [720, 1, 80, 25, 40])
+    assert len(cache) == 2
+    cache.get_info('RUN', [15000, 1, 75])
+    assert cache.stats()['misses'] == 4, (
+        'Давно не использованные записи должны вытесняться из кэша.'
+    )
+
+
+def test_PackageCache_ttl(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(homework.time, 'monotonic', lambda: now[0])
+    cache = homework.PackageCache(ttl=10)
+    cache.get_info('RUN', [15000, 1, 75])
+    now[0] += 5
+    cache.get_info('RUN', [15000, 1, 75])
+    now[0] += 10
+    cache.get_info('RUN', [15000, 1, 75])
+    assert cache.stats()['hits'] == 1 and cache.stats()['misses'] == 2, (
+        'Устаревшие записи должны пересчитываться.'
+    )
+
+
+@pytest.mark.parametrize('workout_type, data', [
+    ('RUN', [15000, 1, 75]),
+    ('WLK', [9000, 1, 75, 180]),
+])
+def test_metrics_computed_once(monkeypatch, workout_type, data):
+    calls = {'get_distance': 0, 'get_mean_speed': 0}
+    for name in calls:
+        method = getattr(homework.Training, name)
+
+        def counted(self, method=method, name=name):
+            calls[name] += 1
+            return method(self)
+        monkeypatch.setattr(homework.Training, name, counted)
+    training = homework.read_package(workout_type, data)
+    training.get_spent_calories()
+    info = training.show_training_info()
+    assert calls == {'get_distance': 1, 'get_mean_speed': 1}, (
+        'Дистанция и скорость должны вычисляться один раз на тренировку.'
+    )
+    assert info == training.show_training_info()
+    assert calls == {'get_distance': 1, 'get_mean_speed': 1}
+
+
+def test_cached_metrics_computed_in_parallel(monkeypatch):
+    barrier = threading.Barrier(2, timeout=5)
+    get_distance = homework.Training.get_distance
+
+    def waiting(self):
+        barrier.wait()
+        return get_distance(self)
+    monkeypatch.setattr(homework.Training, 'get_distance', waiting)
+    trainings = [homework.Running(15000, 1, 75) for _ in range(2)]
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        distances = list(executor.map(lambda training: training.distance,
+                                      trainings))
+    assert distances == [9.75, 9.75], (
+        'Вычисление показателей разных объектов не должно '
+        'ждать общей блокировки.'
+    )
+    assert trainings[0].__dict__['distance'] == 9.75
+
+
+def test_metrics_cache_invalidated():
+    training = homework.Running(15000, 1, 75)
+    info = training.show_training_info()
+    training.duration = 2
+    assert training.mean_speed == info.speed / 2, (
+        'Кэш показателей должен сбрасываться при изменении данных.'
+    )
+    assert training.show_training_info().calories != info.calories
+
+
+@pytest.mark.parametrize('workout_type, data, field, value', [
+    ('WLK', [9000, 1, 75, 180], 'height', 1.6),
+    ('SWM', [720, 1, 80, 25, 40], 'length_pool', 50),
+    ('SWM', [720, 1, 80, 25, 40], 'count_pool', 20),
+])
+def test_metrics_cache_invalidated_by_extra_fields(workout_type, data,
+                                                   field, value):
+    training = homework.read_package(workout_type, data)
+    calories = training.spent_calories
+    setattr(training, field, value)
+    assert getattr(training, field) == value
+    assert training.spent_calories != calories
+
+
+
+@pytest.mark.parametrize('workout_type, data', [
+    ('RUN', [15000, 1, 75]),
+    ('WLK', [9000, 1, 75, 180]),
+    ('SWM', [720, 1, 80, 25, 40]),
+])
+def test_slotted_variant_matches_original(workout_type, data):
+    training_class = homework.TRAINING_CLASSES[workout_type]
+    slotted_class = homework.slotted_variant(training_class)
+    assert slotted_class is homework.slotted_variant(training_class)
+    training = training_class(*data)
+    slotted = slotted_class(*data)
+    assert not hasattr(slotted, '__dict__'), (
+        'У варианта со слотами не должно быть словаря атрибутов.'
+    )
+    assert slotted.show_training_info() == training.show_training_info()
+    slotted.duration = training.duration = 2
+    assert slotted.show_training_info() == training.show_training_info()
+    with pytest.raises(AttributeError):
+        slotted.extra = 1
+
+
+def test_slotted_variants_exported():
+    assert homework.SlottedRunning is homework.slotted_variant(
+        homework.Running)
+    assert issubclass(homework.SlottedSwimming, homework.SlottedTraining)
+    assert homework.SlottedSportsWalking.__name__ == 'SportsWalking'
+
+
+def test_compute_messages_matches_process_packages():
+    packages = [
+        ('SWM', [720, 1, 80, 25, 40]),
+        ('RUN', [15000, 1, 75]),
+        ('WLK', [9000, 1, 75, 180]),
+    ]
+    assert homework.compute_messages(packages) == (
+        homework.process_packages(packages)
+    )
+    assert homework.compute_messages([]) == []
+
+def test_training_registry():
+    assert homework.TRAINING_CLASSES == {'RUN': homework.Running,
+                                         'WLK': homework.SportsWalking,
+                                         'SWM': homework.Swimming}
+    assert homework.Running.FIELDS_COUNT == 3
+    assert homework.SportsWalking.FIELDS_COUNT == 4
+    assert homework.Swimming.FIELDS_COUNT == 5
+
+
+def test_register_third_party_training(monkeypatch):
+    monkeypatch.setattr(homework, 'TRAINING_CLASSES',
+                        dict(homework.TRAINING_CLASSES))
+
+    class Cycling(homework.Running, code='CYC'):
+        LEN_STEP = 5.0
+
+    training = homework.read_package('CYC', [1000, 1, 75])
+    assert isinstance(training, Cycling)
+    assert training.get_distance() == 5.0
+    with pytest.raises(ValueError):
+        class OtherRunning(homework.Running, code='RUN'):
+            pass
+    with pytest.raises(ValueError):
+        class Rowing(homework.Training, code='ROW'):
+            def __init__(self, action, duration, weight=80):
+                super().__init__(action, duration, weight)
+
+
+def test_registered_class_batch_uses_own_formulas(monkeypatch):
+    monkeypatch.setattr(homework, 'TRAINING_CLASSES',
+                        dict(homework.TRAINING_CLASSES))
+
+    class Rowing(homework.Training, code='ROW'):
+        def get_spent_calories(self):
+            return self.weight * self.duration
+
+    class Cycling(homework.Running, code='CYC'):
+        def get_spent_calories(self):
+            return 1.0
+
+    class Paddling(homework.SportsWalking, code='PAD'):
+        def get_distance(self):
+            return self.action / self.M_IN_KM
+
+    assert not Rowing.COLUMN_FORMULAS and not Cycling.COLUMN_FORMULAS
+    assert homework.Running.COLUMN_FORMULAS
+    packages = [('ROW', [1000, 2, 80]), ('RUN', [15000, 1, 75]),
+                ('CYC', [15000, 1, 75]), ('PAD', [9000, 1.5, 75, 180])]
+    columns = list(zip(*(data + [0] * (4 - len(data))
+                         for _, data in packages)))
+    distances, speeds, calories = homework.compute_batch(
+        [workout_type for workout_type, _ in packages],
+        columns[0], columns[1], columns[2], columns[3:])
+    for index, package in enumerate(packages):
+        training = homework.read_package(*package)
+        assert distances[index] == training.get_distance()
+        assert speeds[index] == training.get_mean_speed()
+        assert calories[index] == training.get_spent_calories()
+
+
+@pytest.mark.parametrize('input_data', [
+    ('RUN', [15000, 1]),
+    ('WLK', [9000, 1, 75]),
+    ('SWM', [720, 1, 80, 25, 40, 1]),
+])
+def test_read_package_wrong_fields_count(input_data):
+    with pytest.raises(ValueError):
+        homework.read_package(*input_data)
+
+
+@pytest.mark.parametrize('input_data, expected', [
+    (('RUN', [15000, 1, 75]), None),
+    (('SWM', [720, 1, 80, 25, 0]), None),
+    (('SW1', [720, 1, 80, 25, 40]), 'неопределенный тип тренировки SW1'),
+    (('RUN', [15000, 1]), 'ожидается 3 полей, получено 2'),
+    (('RUN', [15000, 0, 75]), 'поле duration должно быть больше нуля'),
+    (('WLK', [9000, 1, -75, 180]), 'поле weight должно быть больше нуля'),
+    (('RUN', [-1, 1, 75]), 'поле action не может быть отрицательным'),
+    (('WLK', [9000, 1, 75, float('nan')]),
+     'поле height должно быть конечным числом'),
+    (('SWM', [720, 1, 80, '25', 40]), 'поле length_pool должно быть числом'),
+])
+def test_validate_package(input_data, expected):
+    assert homework.validate_package(*input_data) == expected
+
+
+def test_validate_packages():
+    packages = [
+        ('RUN', [15000, 1, 75]),
+        ('RUN', [15000, 0, 75]),
+        ('SW1', [720, 1, 80, 25, 40]),
+        ('WLK', [9000, 1, 75, 180]),
+        ('WLK', [9000, 1, True, 180]),
+        ('SWM', [720, 1, 80, 25, 40]),
+    ]
+    accepted, rejected = homework.validate_packages(packages)
+    assert accepted == [packages[0], packages[3], packages[5]]
+    assert [(index, reason) for index, _, reason in rejected] == [
+        (1, 'поле duration должно быть больше нуля'),
+        (2, 'неопределенный тип тренировки SW1'),
+        (4, 'поле weight должно быть числом'),
+    ]
+    assert homework.validate_packages([]) == ([], [])
+
+
+@pytest.mark.parametrize('packages, rejected_indexes', [
+    ([('RUN', [Decimal(1), 1, 75])] * 2, [0, 1]),
+    ([('RUN', [Fraction(1, 2), 1, 75])] * 2, [0, 1]),
+    ([('RUN', [1e308, 1, 75])] * 2, []),
+    ([('RUN', [10 ** 400, 1, 75]), ('RUN', [15000, 1, 75])], [0]),
+    ([('RUN', [15000, 1, 75]), ('RUN', [float('nan'), 1, 75])], [1]),
+])
+def test_validate_packages_matches_validate_package(packages,
+                                                    rejected_indexes):
+    accepted, rejected = homework.validate_packages(packages)
+    expected = []
+    for index, package in enumerate(packages):
+        reason = homework.validate_package(*package)
+        if reason is not None:
+            expected.append((index, reason))
+    assert [(index, reason) for index, _, reason in rejected] == expected
+    assert [index for index, _, _ in rejected] == rejected_indexes
+    for package in accepted:
+        homework.read_package(*package).show_training_info()
+
+
+@pytest.mark.parametrize('cache', [None, homework.PackageCache(capacity=2)])
+def test_TrainingCalculator_threads(cache):
+    packages = [
+        ('SWM', [720, 1, 80, 25, 40]),
+        ('RUN', [15000, 1, 75]),
+        ('WLK', [9000, 1, 75, 180]),
+        ('RUN', [1206, 12, 6]),
+    ] * 50
+    expected = homework.format_messages(homework.process_packages(packages))
+    calculator = homework.TrainingCalculator(cache)
+
+    def work(shift):
+        shifted = packages[shift:] + packages[:shift]
+        return shift, calculator.format_many(shifted)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(work, range(32)))
+    for shift, result in results:
+        lines = expected.splitlines(keepends=True)
+        assert result == ''.join(lines[shift:] + lines[:shift]), (
+            'Результаты калькулятора не должны зависеть от других потоков.'
+        )
+    if cache is not None:
+        stats = cache.stats()
+        assert stats['hits'] + stats['misses'] == 32 * len(packages)
+        assert stats['size'] == 2
@@ -0,0 +1,41 @@
+import pytest
+
+import homework
+import metrics
+
+
+@pytest.fixture
+def instrumented():
+    metrics.metrics.reset()
+    metrics.enable()
+    yield metrics.metrics
+    metrics.disable()
+    metrics.metrics.reset()
+
+
+def test_disabled_by_default():
+    assert not metrics.is_enabled()
+    assert homework.InfoMessage.get_message.__module__ == 'homework'
+
+
+def test_counts_per_training_type(instrumented):
+    for workout_type, data in [('RUN', [15000, 1, 75]),
+                               ('RUN', [1206, 12, 6]),
+                               ('SWM', [720, 1, 80, 25, 40])]:
+        training = homework.read_package(workout_type, data)
+        training.show_training_info().get_message()
+    snapshot = instrumented.snapshot()
+    for operation in ['read_package', 'show_training_info', 'get_message']:
+        assert snapshot[operation]['Running']['count'] == 2
+        assert snapshot[operation]['Swimming']['count'] == 1
+        assert sum(snapshot[operation]['Running']['buckets']) == 2
+    assert metrics.percentile_ns(snapshot['get_message']['Running'],
+                                 50) is not None
+    assert '"read_package"' in instrumented.export_json()
+
+
+def test_disable_restores_functions(instrumented):
+    metrics.disable()
+    homework.read_package('RUN', [15000, 1, 75])
+    assert instrumented.snapshot() == {}
+    assert homework.Training.show_training_info.__module__ == 'homework'
@@ -0,0 +1,47 @@
+import csv
+import gzip
+import io
+import json
+
+import pytest
+
+import homework
+import report
+
+MESSAGES = [homework.InfoMessage('Swimming', 1, 0.9936, 1.0, 336.0),
+            homework.InfoMessage('Running', 12, 0.7839, 0.065325, 12.812)]
+
+
+def test_text_report():
+    stream = io.StringIO()
+    assert report.write_report(MESSAGES, stream, chunk_size=1) == 2
+    assert stream.getvalue().splitlines() == [
+        info.get_message() for info in MESSAGES]
+
+
+def test_csv_report():
+    stream = io.StringIO()
+    report.write_report(MESSAGES, stream, fmt='csv')
+    rows = list(csv.DictReader(io.StringIO(stream.getvalue())))
+    assert [row['training_type'] for row in rows] == ['Swimming', 'Running']
+    assert float(rows[1]['speed']) == 0.065325
+
+
+def test_gzip_jsonl_report(tmp_path):
+    path = str(tmp_path / 'report.jsonl.gz')
+    report.write_report(iter(MESSAGES), path, fmt='jsonl')
+    with gzip.open(path, 'rt', encoding='utf-8') as file:
+        lines = [json.loads(line) for line in file]
+    assert lines[0] == {'training_type': 'Swimming', 'duration': 1,
+                        'distance': 0.9936, 'speed': 1.0,
+                        'calories': 336.0}
+
+
+def test_stdout_report(capsys):
+    report.write_report(MESSAGES[:1])
+    assert capsys.readouterr().out == MESSAGES[0].get_message() + '\n'
+
+
+def test_unknown_format():
+    with pytest.raises(ValueError):
+        report.write_report(MESSAGES, io.StringIO(), fmt='xml')
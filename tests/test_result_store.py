@@ -0,0 +1,64 @@
+import pytest
+
+import homework
+import result_store
+
+PACKAGES = [
+    ('SWM', [720, 1, 80, 25, 40]),
+    ('RUN', [15000, 1, 75]),
+    ('WLK', [9000, 1, 75, 180]),
+    ('RUN', [1206, 12, 6]),
+]
+
+
+@pytest.fixture
+def store():
+    store = result_store.ResultStore()
+    store.extend(homework.process_packages(PACKAGES[:2]))
+    workout_types = [workout_type for workout_type, _ in PACKAGES[2:]]
+    durations = [data[1] for _, data in PACKAGES[2:]]
+    distances, speeds, calories = homework.compute_batch(
+        workout_types, [data[0] for _, data in PACKAGES[2:]], durations,
+        [data[2] for _, data in PACKAGES[2:]], [[180, 0]])
+    store.extend_columns(['SportsWalking', 'Running'], durations,
+                         distances, speeds, calories)
+    return store
+
+
+def test_store_roundtrip(store):
+    assert len(store) == 4
+    assert list(store) == homework.process_packages(PACKAGES)
+    assert store.dictionary == ['Swimming', 'Running', 'SportsWalking']
+
+
+def test_select(store):
+    assert list(store.select('Running')) == [1, 3]
+    assert list(store.select(calories=(300, None))) == [0, 1, 2]
+    assert list(store.select('Running', duration=(None, 1),
+                             calories=(100, 1000))) == [1]
+    selected = store.select(speed=(1, None), calories=(None, 400))
+    assert list(selected) == [0, 2]
+    assert list(store.select('Cycling')) == []
+    with pytest.raises(ValueError):
+        store.select(weight=(1, 2))
+
+
+def test_save_and_open(store, tmp_path):
+    path = str(tmp_path / 'results.bin')
+    store.save(path)
+    with result_store.ResultStore.open(path) as mapped:
+        assert mapped.readonly
+        assert list(mapped) == list(store)
+        assert list(mapped.select('Running')) == [1, 3]
+        columns = mapped.to_columns()
+        assert columns['training_type']['dictionary'] == store.dictionary
+        assert list(columns['calories']) == list(store.columns['calories'])
+        with pytest.raises(ValueError):
+            mapped.append(store[0])
+
+
+def test_open_bad_file(tmp_path):
+    path = tmp_path / 'bad.bin'
+    path.write_bytes(b'RES1' + bytes(4))
+    with pytest.raises(ValueError):
+        result_store.ResultStore.open(str(path))
@@ -0,0 +1,52 @@
+from array import array
+
+import pytest
+
+import homework
+import segments
+
+
+@pytest.mark.parametrize('workout_type, data', [
+    ('RUN', [15000, 1, 75]),
+    ('WLK', [9000, 1, 75, 180]),
+    ('SWM', [720, 1, 80, 25, 40]),
+])
+def test_uniform_segments_match_training(workout_type, data):
+    action, duration, weight, *extras = data
+    if workout_type == 'SWM':
+        extras = [extras[0], [extras[1] / 4] * 4]
+    training = segments.SegmentedTraining(
+        workout_type, array('d', [action / 4] * 4),
+        memoryview(array('d', [duration / 4] * 4)), weight, *extras)
+    info = training.show_training_info()
+    expected = homework.read_package(workout_type, data).show_training_info()
+    assert info.training_type == expected.training_type
+    for field in ['duration', 'distance', 'speed', 'calories']:
+        assert getattr(info, field) == pytest.approx(getattr(expected,
+                                                             field))
+
+
+def test_segments_use_per_segment_speed():
+    training = segments.SegmentedTraining('WLK', [6000, 3000], [0.5, 0.5],
+                                          75, 180)
+    distances, speeds, calories = training.get_segments()
+    assert speeds == [7.8, 3.9]
+    info = training.show_training_info()
+    assert info.distance == pytest.approx(5.85)
+    assert info.speed == pytest.approx(5.85)
+    average = homework.read_package('WLK', [9000, 1, 75, 180])
+    assert info.calories > average.get_spent_calories(), (
+        'Калории ходьбы нелинейны по скорости и зависят от отрезков.'
+    )
+
+
+@pytest.mark.parametrize('args', [
+    ('SW1', [1], [1], 80),
+    ('RUN', [1, 2], [1], 80),
+    ('RUN', [], [], 80),
+    ('WLK', [1], [1], 80),
+    ('SWM', [1, 2], [1, 1], 80, 25, [1]),
+])
+def test_invalid_segments(args):
+    with pytest.raises(ValueError):
+        segments.SegmentedTraining(*args)
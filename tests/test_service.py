@@ -0,0 +1,157 @@
+import asyncio
+
+import pytest
+
+import homework
+import service
+
+
+async def exchange(lines):
+    training_service = service.TrainingService(max_batch=8, max_delay=0.01)
+    server = await training_service.serve('127.0.0.1', 0)
+    port = server.sockets[0].getsockname()[1]
+    try:
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        writer.write(''.join(line + '\n' for line in lines).encode())
+        await writer.drain()
+        responses = [(await reader.readline()).decode().rstrip('\n')
+                     for _ in lines]
+        writer.close()
+        await writer.wait_closed()
+        load = await service.run_load('127.0.0.1', port, lines[0],
+                                      requests=20, concurrency=4)
+    finally:
+        server.close()
+        await server.wait_closed()
+        await training_service.stop()
+    return responses, load, training_service.batches
+
+
+def test_service_responses():
+    responses, load, batches = asyncio.run(exchange([
+        'RUN 1206 12 6',
+        'SW1 720 1 80 25 40',
+        'WLK 9000 1 75 180',
+    ]))
+    assert responses == [
+        'Тип тренировки: Running; '
+        'Длительность: 12.000 ч.; '
+        'Дистанция: 0.784 км; '
+        'Ср. скорость: 0.065 км/ч; '
+        'Потрачено ккал: 12.812.',
+        'ERROR неопределенный тип тренировки SW1',
+        'Тип тренировки: SportsWalking; '
+        'Длительность: 1.000 ч.; '
+        'Дистанция: 5.850 км; '
+        'Ср. скорость: 5.850 км/ч; '
+        'Потрачено ккал: 349.252.',
+    ]
+    assert load['requests'] == 20
+    assert load['p50'] <= load['p99']
+    assert batches > 0
+
+
+async def submit_concurrently(count):
+    training_service = service.TrainingService(max_batch=count,
+                                               max_delay=1)
+    await training_service.start()
+    try:
+        results = await asyncio.gather(*(
+            training_service.submit(('RUN', [15000, 1, 75]))
+            for _ in range(count)))
+    finally:
+        await training_service.stop()
+    return results, training_service.batches
+
+
+def test_service_coalesces_requests():
+    results, batches = asyncio.run(submit_concurrently(10))
+    assert len(results) == 10
+    assert batches == 1, 'Одновременные запросы должны объединяться в пачку.'
+
+
+async def pipeline(lines):
+    training_service = service.TrainingService(max_batch=len(lines),
+                                               max_delay=1)
+    server = await training_service.serve('127.0.0.1', 0)
+    port = server.sockets[0].getsockname()[1]
+    try:
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        writer.write(''.join(line + '\n' for line in lines).encode())
+        await writer.drain()
+        responses = [(await reader.readline()).decode().rstrip('\n')
+                     for _ in lines]
+        writer.close()
+        await writer.wait_closed()
+    finally:
+        server.close()
+        await server.wait_closed()
+        await training_service.stop()
+    return responses, training_service.batches
+
+
+def test_service_coalesces_pipelined_lines():
+    lines = ['RUN 15000 1 75', 'RUN 15000 0 75', 'WLK 9000 1 75 180',
+             'SWM 720 1 80 25 40']
+    responses, batches = asyncio.run(pipeline(lines))
+    assert batches == 1, 'Строки одного клиента должны объединяться.'
+    assert responses == [
+        homework.read_package('RUN', [15000, 1, 75])
+        .show_training_info().get_message(),
+        'ERROR поле duration должно быть больше нуля',
+        homework.read_package('WLK', [9000, 1, 75, 180])
+        .show_training_info().get_message(),
+        homework.read_package('SWM', [720, 1, 80, 25, 40])
+        .show_training_info().get_message(),
+    ]
+
+
+async def respond_together(lines):
+    training_service = service.TrainingService(max_batch=len(lines),
+                                               max_delay=1)
+    await training_service.start()
+    try:
+        responses = await asyncio.gather(*(
+            training_service._respond(line) for line in lines))
+    finally:
+        await training_service.stop()
+    return responses, training_service.batches
+
+
+def test_service_isolates_failing_package():
+    responses, batches = asyncio.run(respond_together(
+        ['RUN 15000 1 75', 'WLK 1e204 1 75 180', 'WLK 9000 1 75 180']))
+    assert batches == 1
+    assert responses[0] == homework.read_package(
+        'RUN', [15000, 1, 75]).show_training_info().get_message()
+    assert responses[1].startswith('ERROR ')
+    assert responses[2] == homework.read_package(
+        'WLK', [9000, 1, 75, 180]).show_training_info().get_message()
+
+
+async def stop_with_pending(count):
+    training_service = service.TrainingService(max_batch=count + 1,
+                                               max_delay=10)
+    await training_service.start()
+    tasks = [asyncio.create_task(
+        training_service.submit(('RUN', [15000, 1, 75])))
+        for _ in range(count)]
+    await asyncio.sleep(0.01)
+    await training_service.stop()
+    return await asyncio.wait_for(
+        asyncio.gather(*tasks, return_exceptions=True), 1)
+
+
+def test_service_stop_cancels_pending():
+    results = asyncio.run(stop_with_pending(3))
+    assert all(isinstance(result, asyncio.CancelledError)
+               for result in results)
+
+
+@pytest.mark.parametrize('values, percent, expected', [
+    ([5, 1, 3, 2, 4], 50, 3),
+    ([5, 1, 3, 2, 4], 99, 5),
+    ([7], 1, 7),
+])
+def test_percentile(values, percent, expected):
+    assert service.percentile(values, percent) == expected
@@ -0,0 +1,62 @@
+import random
+import statistics
+
+import pytest
+
+import homework
+import sketches
+
+
+def test_running_stats_merge():
+    generator = random.Random(0)
+    values = [generator.uniform(0, 1000) for _ in range(1000)]
+    left, right = sketches.RunningStats(), sketches.RunningStats()
+    for value in values[:300]:
+        left.add(value)
+    for value in values[300:]:
+        right.add(value)
+    left.merge(sketches.RunningStats.from_bytes(right.to_bytes()))
+    assert left.count == 1000
+    assert left.mean == pytest.approx(statistics.fmean(values))
+    assert left.variance == pytest.approx(statistics.variance(values))
+    assert (left.minimum, left.maximum) == (min(values), max(values))
+
+
+@pytest.mark.parametrize('q', [0, 0.5, 0.95, 0.99, 1])
+def test_quantile_sketch_accuracy(q):
+    generator = random.Random(1)
+    values = sorted(generator.lognormvariate(5, 1) for _ in range(5000))
+    parts = [sketches.QuantileSketch(0.01) for _ in range(3)]
+    for index, value in enumerate(values):
+        parts[index % 3].add(value)
+    sketch = parts[0]
+    for part in parts[1:]:
+        sketch.merge(sketches.QuantileSketch.from_bytes(part.to_bytes()))
+    expected = values[int(q * (len(values) - 1))]
+    assert sketch.quantile(q) == pytest.approx(expected, rel=0.01)
+
+
+def test_quantile_sketch_errors():
+    sketch = sketches.QuantileSketch()
+    assert sketch.quantile(0.5) is None
+    sketch.add(0)
+    assert sketch.quantile(0.5) == 0
+    with pytest.raises(ValueError):
+        sketch.add(-1)
+    with pytest.raises(ValueError):
+        sketch.merge(sketches.QuantileSketch(0.05))
+
+
+def test_workout_stats():
+    packages = [('RUN', [15000, 1, 75]), ('RUN', [1206, 12, 6]),
+                ('SWM', [720, 1, 80, 25, 40])]
+    first, second = sketches.WorkoutStats(), sketches.WorkoutStats()
+    first.extend(homework.process_packages(packages[:2]))
+    second.extend(homework.process_packages(packages[2:]))
+    first.merge(sketches.WorkoutStats.from_bytes(second.to_bytes()))
+    summary = first.summary()
+    assert set(summary) == {'Running', 'Swimming'}
+    assert summary['Running']['calories']['count'] == 2
+    assert summary['Swimming']['speed']['p50'] == pytest.approx(1.0,
+                                                                rel=0.01)
+    assert summary['Running']['calories']['max'] == pytest.approx(797.805)